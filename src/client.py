@@ -4,14 +4,28 @@ Supports two backends:
   - ollama: Ollama native API (default)
   - lmstudio: LM Studio OpenAI-compatible API
 """
+import asyncio
 import httpx
 import json
 import logging
 import re
+from collections import OrderedDict
 from typing import AsyncGenerator, Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+def _decode_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, using orjson when installed (~3x faster)."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 # Type aliases
 Message = Dict[str, Any]
 Messages = List[Message]
@@ -71,9 +85,28 @@ class OllamaClient:
     def _get_client(cls) -> httpx.AsyncClient:
         """Get or create the shared httpx client."""
         if cls._shared_client is None or cls._shared_client.is_closed:
-            cls._shared_client = httpx.AsyncClient(timeout=None)
+            kwargs = dict(
+                # Generous read timeout for slow generations; call sites
+                # that need tighter bounds pass their own per request
+                timeout=httpx.Timeout(connect=5.0, read=300.0, write=30.0, pool=5.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+            try:
+                # HTTP/2 multiplexes overlapping calls (stream + vision +
+                # unload) over one connection when the backend supports it;
+                # plain HTTP/1.1 servers are negotiated down transparently
+                cls._shared_client = httpx.AsyncClient(http2=True, **kwargs)
+            except ImportError:
+                logger.info("h2 not installed, using HTTP/1.1 for LLM client")
+                cls._shared_client = httpx.AsyncClient(**kwargs)
         return cls._shared_client
 
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        """Close the shared client (call on application shutdown)."""
+        if cls._shared_client is not None and not cls._shared_client.is_closed:
+            await cls._shared_client.aclose()
+
     # ── Chat Streaming ──────────────────────────────────────────────
 
     async def stream_chat(
@@ -354,14 +387,19 @@ class OllamaClient:
             "model": model,
             "keep_alive": 0
         }
+        # Fire-and-forget: the caller discards the response, so don't block
+        # on the network round trip.
+        asyncio.create_task(self._post_unload(url, payload, model))
+        return True
+
+    async def _post_unload(self, url: str, payload: Dict[str, Any], model: str) -> None:
+        """Send the unload POST in the background, swallowing any error."""
         try:
             client = self._get_client()
-            await client.post(url, json=payload)
+            await client.post(url, json=payload, timeout=5.0)
             logger.info(f"Successfully unloaded model: {model}")
-            return True
         except Exception as e:
             logger.warning(f"Failed to unload model {model}: {e}")
-            return False
 
     # ── Vision ──────────────────────────────────────────────────────
 
@@ -399,7 +437,7 @@ class OllamaClient:
             client = self._get_client()
             response = await client.post(url, json=payload, timeout=300)
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 description = data.get("message", {}).get("content", "[No description]")
                 # Strip thinking tags
                 description = re.sub(r'<think>.*?</think>', '', description, flags=re.DOTALL)
@@ -452,7 +490,7 @@ class OllamaClient:
             client = self._get_client()
             response = await client.post(url, json=payload, timeout=300)
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 choices = data.get("choices", [])
                 if choices:
                     content = choices[0].get("message", {}).get("content", "[No description]")
@@ -482,17 +520,87 @@ class OllamaClient:
 
     # ── Embeddings ───────────────────────────────────────────────────
 
+    # Embeddings are deterministic for a given (model, text), so repeated
+    # requests — same RAG query, re-scored research chunks — can be served
+    # from memory instead of hitting the backend again
+    _embedding_cache: "OrderedDict[tuple, List[float]]" = OrderedDict()
+    _EMBEDDING_CACHE_SIZE = 1024
+    _embedding_cache_hits = 0
+    _embedding_cache_misses = 0
+
     async def generate_embedding(self, model: str, text: str) -> List[float]:
         """
         Generate embeddings for text using a specific model.
-        
+
         Routes to the configured backend:
           - ollama: POST /api/embeddings
           - lmstudio: POST /v1/embeddings (OpenAI-compatible)
+
+        Results are memoized in a small LRU cache shared across instances.
         """
+        key = (self.provider, model, text)
+        cache = OllamaClient._embedding_cache
+        if key in cache:
+            cache.move_to_end(key)
+            OllamaClient._embedding_cache_hits += 1
+            return cache[key]
+        OllamaClient._embedding_cache_misses += 1
+
         if self.provider == "lmstudio":
-            return await self._embedding_openai(model, text)
-        return await self._embedding_ollama(model, text)
+            embedding = await self._embedding_openai(model, text)
+        else:
+            embedding = await self._embedding_ollama(model, text)
+
+        if embedding:
+            cache[key] = embedding
+            if len(cache) > self._EMBEDDING_CACHE_SIZE:
+                cache.popitem(last=False)
+        return embedding
+
+    @classmethod
+    def embedding_cache_stats(cls) -> Dict[str, int]:
+        """Hit/miss counters and current size of the embedding cache."""
+        return {
+            "hits": cls._embedding_cache_hits,
+            "misses": cls._embedding_cache_misses,
+            "size": len(cls._embedding_cache),
+        }
+
+    async def embed_batch(self, model: str, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts in one request.
+
+        Uses Ollama's batched /api/embed (or LM Studio's /v1/embeddings,
+        which accepts array input), so N texts cost one HTTP round-trip.
+        Falls back to per-text requests if the batched call fails.
+        """
+        if not texts:
+            return []
+
+        try:
+            if self.provider == "lmstudio":
+                url = f"{self.base_url}/v1/embeddings"
+                payload = {"model": model, "input": texts}
+                client = self._get_client()
+                response = await client.post(url, json=payload, timeout=120.0)
+                if response.status_code == 200:
+                    data = _decode_json(response)
+                    return [item.get("embedding", []) for item in data.get("data", [])]
+            else:
+                url = f"{self.base_url}/api/embed"
+                payload = {"model": model, "input": texts}
+                client = self._get_client()
+                response = await client.post(url, json=payload, timeout=120.0)
+                if response.status_code == 200:
+                    data = _decode_json(response)
+                    return data.get("embeddings", [])
+            logger.warning(f"Batched embedding returned {response.status_code}, falling back to per-text requests")
+        except Exception as e:
+            logger.warning(f"Batched embedding failed ({e}), falling back to per-text requests")
+
+        return list(await asyncio.gather(
+            *(self.generate_embedding(model, text) for text in texts)
+        ))
 
     async def _embedding_ollama(self, model: str, text: str) -> List[float]:
         """Generate embedding via Ollama native API."""
@@ -506,7 +614,7 @@ class OllamaClient:
             client = self._get_client()
             response = await client.post(url, json=payload, timeout=30.0)
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 return data.get("embedding", [])
             else:
                 logger.error(f"Embedding error {response.status_code}: {response.text}")
@@ -528,7 +636,7 @@ class OllamaClient:
             client = self._get_client()
             response = await client.post(url, json=payload, timeout=30.0)
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 embeddings = data.get("data", [])
                 if embeddings:
                     return embeddings[0].get("embedding", [])
@@ -24,13 +24,15 @@ class CommandHandlers:
         is_authorized_func,
         get_system_prompt_func,
         email_digest_job=None,
-        update_activity_func=None
+        update_activity_func=None,
+        reload_instructions_func=None
     ):
         self.chat_manager = chat_manager
         self.is_authorized = is_authorized_func
         self.get_system_prompt = get_system_prompt_func
         self.email_digest_job = email_digest_job
         self.update_activity = update_activity_func
+        self.reload_instructions = reload_instructions_func
     
     @rate_limit(max_messages=5, window_seconds=60)
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -76,6 +78,25 @@ class CommandHandlers:
         )
         logger.info(f"New conversation started for chat {chat_id}")
     
+    @rate_limit(max_messages=3, window_seconds=60)
+    async def reload_instructions_cmd(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /reload command - re-read system instructions from disk."""
+        user_id = update.effective_user.id
+
+        if not self.is_authorized(user_id):
+            await update.message.reply_text(
+                f"⛔ No tienes acceso.",
+                parse_mode="Markdown"
+            )
+            return
+
+        if self.reload_instructions:
+            self.reload_instructions()
+        await update.message.reply_text(
+            "🔄 Instructions reloaded. Use /new to apply them to this chat."
+        )
+        logger.info(f"Instructions reloaded by user {user_id}")
+
     @rate_limit(max_messages=3, window_seconds=60)
     async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command - show token usage."""
@@ -130,20 +130,19 @@ class DocumentHandler:
             await status_msg.edit_text(f"🧠 Indexing {len(chunks)} chunks of {doc_type} document...")
             
             timestamp = str(datetime.now())
-            for i, chunk in enumerate(chunks):
-                chunk_meta = {
+            metadatas = [
+                {
                     "source": file_name,
                     "type": doc_type,
                     "timestamp": timestamp,
                     "chunk_id": i
                 }
-                await self.vector_manager.add_document(chunk, chunk_meta)
-                if i > 0 and i % 5 == 0:
-                    try:
-                        await status_msg.edit_text(f"🧠 Indexing chunk {i}/{len(chunks)} of {doc_type} document...")
-                    except Exception:
-                        pass # Ignore if same text
-                        
+                for i in range(len(chunks))
+            ]
+            # One batched embedding request + one ChromaDB insert for
+            # the whole document instead of a round-trip per chunk
+            await self.vector_manager.add_documents(chunks, metadatas)
+
             await status_msg.edit_text(f"🧠 Processing {doc_type} document with LLM...")
             
             # Initialize chat history if needed
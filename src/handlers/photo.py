@@ -278,7 +278,7 @@ class PhotoHandler:
             uploader = UploadService()
             
             await status_msg.edit_text("📤 Uploading to Catbox.moe...")
-            url = await asyncio.to_thread(uploader.upload_to_catbox, file_path)
+            url = await uploader.upload_to_catbox(file_path)
             
             if url:
                  await status_msg.edit_text(f"✅ Upload complete:\n{url}", disable_web_page_preview=True)
@@ -80,9 +80,7 @@ class VideoHandler:
             uploader = UploadService()
             
             await status_msg.edit_text("📤 Uploading to Catbox.moe...")
-            # Run blocking upload in thread
-            import asyncio
-            url = await asyncio.to_thread(uploader.upload_to_catbox, file_path)
+            url = await uploader.upload_to_catbox(file_path)
             
             if url:
                  await status_msg.edit_text(f"✅ Upload complete:\n{url}", disable_web_page_preview=True)
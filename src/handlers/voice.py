@@ -17,10 +17,9 @@ logger = logging.getLogger(__name__)
 class VoiceHandler:
     """Handler for voice messages."""
     
-    def __init__(self, is_authorized_func, message_queue, start_worker_func=None):
+    def __init__(self, is_authorized_func, enqueue_func=None):
         self.is_authorized = is_authorized_func
-        self.message_queue = message_queue
-        self.start_worker = start_worker_func
+        self.enqueue = enqueue_func
     
     @rate_limit(max_messages=5, window_seconds=60)
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -107,13 +106,10 @@ class VoiceHandler:
                 chunks = await telegramify_content(text)
                 await send_telegramify_results(context, chat_id, chunks, status_msg)
                 
-                # Add to queue with transcription text
-                needs_reply = not self.message_queue.empty()
-                await self.message_queue.put((update, context, needs_reply, transcription))
-                
-                if self.start_worker:
-                    self.start_worker()
-                    
+                # Hand off to this chat's worker with the transcription text
+                if self.enqueue:
+                    await self.enqueue(update, context, transcription)
+
         except Exception as e:
             logger.error(f"Error processing voice: {e}")
             await status_msg.edit_text(f"❌ Error: {str(e)}")
@@ -1,7 +1,9 @@
 """
 Vector Store Manager using ChromaDB and Ollama Embeddings.
 """
+import asyncio
 import logging
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from typing import List, Dict, Any, Optional
@@ -64,46 +66,133 @@ class VectorManager:
             name="skills",
             metadata={"hnsw:space": "cosine"}
         )
-        
+
+        # Write-behind queue for document ingestion.
+        # Each .add() acquires Chroma's HNSW insertion lock, so documents are
+        # accumulated briefly and inserted in a single batched call.
+        self._pending_docs: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
         logger.info(f"VectorManager initialized with model: {self.embedding_model}")
 
-    async def _get_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text using Ollama."""
-        return await self.client.generate_embedding(self.embedding_model, text)
+    async def _get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """
+        Generate embedding for text using Ollama.
+
+        Returns a contiguous float32 ndarray (or None on failure) so it can
+        be handed to Chroma directly, skipping the list->numpy round trip.
+        """
+        vec = await self.client.generate_embedding(self.embedding_model, text)
+        if not vec:
+            return None
+        return np.asarray(vec, dtype=np.float32)
 
     async def add_document(self, text: str, metadata: Dict[str, Any], doc_id: str = None) -> bool:
         """
         Add a document chunk to the vector store.
+
+        Writes are batched: the document is queued and flushed to ChromaDB
+        shortly after, together with any other pending documents.
+        Call flush() to force pending writes (e.g. on shutdown).
         """
         try:
             embedding = await self._get_embedding(text)
-            if not embedding:
+            if embedding is None:
                 logger.warning("Failed to generate embedding for document")
                 return False
-                
-            self.documents_collection.add(
-                documents=[text],
-                embeddings=[embedding],
-                metadatas=[metadata],
-                ids=[doc_id or str(hash(text))]
-            )
+
+            self._pending_docs.append({
+                "document": text,
+                "embedding": embedding,
+                "metadata": metadata,
+                "id": doc_id or str(hash(text))
+            })
+
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._delayed_flush())
             return True
         except Exception as e:
             logger.error(f"Error adding document to vector store: {e}")
             return False
 
+    async def add_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str] = None
+    ) -> bool:
+        """
+        Add many document chunks at once: one batched embedding request
+        and one ChromaDB insert, instead of a round-trip per chunk.
+        """
+        if not texts:
+            return True
+
+        try:
+            embeddings = await self.client.embed_batch(self.embedding_model, texts)
+
+            id_list = ids or [str(hash(text)) for text in texts]
+            kept = []
+            for text, vec, meta, doc_id in zip(texts, embeddings, metadatas, id_list):
+                if vec:
+                    kept.append((text, np.asarray(vec, dtype=np.float32), meta, doc_id))
+            if len(kept) < len(texts):
+                logger.warning(f"Failed to embed {len(texts) - len(kept)} of {len(texts)} documents")
+            if not kept:
+                return False
+
+            await asyncio.to_thread(
+                self.documents_collection.add,
+                documents=[item[0] for item in kept],
+                embeddings=np.stack([item[1] for item in kept]),
+                metadatas=[item[2] for item in kept],
+                ids=[item[3] for item in kept]
+            )
+            logger.debug(f"Added {len(kept)} document(s) to vector store in one batch")
+            return True
+        except Exception as e:
+            logger.error(f"Error batch-adding documents to vector store: {e}")
+            return False
+
+    async def _delayed_flush(self) -> None:
+        """Wait briefly to accumulate a batch, then flush pending documents."""
+        await asyncio.sleep(0.1)
+        await self.flush()
+
+    async def flush(self) -> bool:
+        """
+        Write all pending documents to ChromaDB in a single batched add.
+        """
+        batch, self._pending_docs = self._pending_docs, []
+        if not batch:
+            return True
+
+        try:
+            await asyncio.to_thread(
+                self.documents_collection.add,
+                documents=[item["document"] for item in batch],
+                embeddings=np.stack([item["embedding"] for item in batch]),
+                metadatas=[item["metadata"] for item in batch],
+                ids=[item["id"] for item in batch]
+            )
+            logger.debug(f"Flushed {len(batch)} document(s) to vector store")
+            return True
+        except Exception as e:
+            logger.error(f"Error flushing documents to vector store: {e}")
+            return False
+
     async def add_memory(self, text: str, metadata: Dict[str, Any] = None) -> bool:
         """
         Add a memory fragment (fact/conversation) to the vector store.
         """
         try:
             embedding = await self._get_embedding(text)
-            if not embedding:
+            if embedding is None:
                 return False
-                
+
             self.memory_collection.add(
                 documents=[text],
-                embeddings=[embedding],
+                embeddings=embedding[None, :],
                 metadatas=[metadata or {"type": "memory"}],
                 ids=[str(hash(text + str(metadata)))] # Basic ID generation
             )
@@ -117,36 +206,35 @@ class VectorManager:
         Delete a memory by finding the most similar entry and removing it.
         """
         try:
-            # 1. Find the memory ID first
-            results = await self.search(text_fragment, collection_type="memory", limit=1)
-            
-            if not results:
-                logger.warning(f"Memory not found for deletion: {text_fragment}")
-                return False
-                
-            best_match = results[0]
-            # Verify it's actually similar enough to avoid accidental deletions
-            if best_match['similarity'] < 0.85: # High threshold for deletion
-                 logger.warning(f"Deletetion aborted. Best match '{best_match['content']}' similarity {best_match['similarity']} too low.")
-                 return False
-
-            # 2. Delete by ID
-            # In Chroma, we need the ID. The search results usually return metadatas/documents.
-            # We need to query again or store IDs better.
-            # Rerunning query to get ID
+            # One embedding + one query: the raw result carries the ID,
+            # document and distance, so no second lookup is needed
             query_embedding = await self._get_embedding(text_fragment)
-            raw_results = self.memory_collection.query(
-                query_embeddings=[query_embedding],
+            if query_embedding is None:
+                return False
+
+            raw_results = await asyncio.to_thread(
+                self.memory_collection.query,
+                query_embeddings=query_embedding[None, :],
                 n_results=1
             )
-            
-            if raw_results['ids'] and raw_results['ids'][0]:
-                target_id = raw_results['ids'][0][0]
-                self.memory_collection.delete(ids=[target_id])
-                logger.info(f"Deleted memory: {best_match['content']} (ID: {target_id})")
-                return True
-                
-            return False
+
+            if not raw_results['ids'] or not raw_results['ids'][0]:
+                logger.warning(f"Memory not found for deletion: {text_fragment}")
+                return False
+
+            distance = raw_results['distances'][0][0] if raw_results.get('distances') else 1.0
+            similarity = 1 - distance
+            content = raw_results['documents'][0][0]
+
+            # Verify it's actually similar enough to avoid accidental deletions
+            if similarity < 0.85: # High threshold for deletion
+                logger.warning(f"Deletetion aborted. Best match '{content}' similarity {similarity} too low.")
+                return False
+
+            target_id = raw_results['ids'][0][0]
+            self.memory_collection.delete(ids=[target_id])
+            logger.info(f"Deleted memory: {content} (ID: {target_id})")
+            return True
         except Exception as e:
             logger.error(f"Error deleting memory: {e}")
             return False
@@ -179,11 +267,10 @@ class VectorManager:
                 doc_text = f"Skill: {name}\n\n{content}"
                 
                 embedding = await self._get_embedding(doc_text)
-                if embedding:
-                    # Chroma expects list of floats for embedding
+                if embedding is not None:
                     self.skills_collection.add(
                         documents=[doc_text],
-                        embeddings=[embedding],
+                        embeddings=embedding[None, :],
                         metadatas=[{"name": name}],
                         ids=[name]
                     )
@@ -199,11 +286,11 @@ class VectorManager:
         """
         try:
             query_embedding = await self._get_embedding(query)
-            if not query_embedding:
+            if query_embedding is None:
                 return []
-                
+
             results = self.skills_collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=query_embedding[None, :],
                 n_results=limit
             )
             
@@ -238,34 +325,89 @@ class VectorManager:
         
         try:
             query_embedding = await self._get_embedding(query)
-            if not query_embedding:
+            if query_embedding is None:
                 return []
-                
+
             results = collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=query_embedding[None, :],
                 n_results=limit
             )
-            
-            # Parse results
+
+            return self._parse_query_results(results)
+
+        except Exception as e:
+            logger.error(f"Error searching vector store: {e}")
+            return []
+
+    async def search_multi(
+        self,
+        query: str,
+        collection_types: List[str] = None,
+        limit: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search several collections with one call, merged by similarity.
+
+        The query is embedded once and the collection queries run
+        concurrently, so callers that want documents + memory pay a single
+        embedding round-trip instead of one per collection.
+        """
+        limit = limit or self.max_results
+        if collection_types is None:
+            collection_types = ["documents", "memory"]
+
+        collections = {
+            "documents": self.documents_collection,
+            "memory": self.memory_collection,
+        }
+
+        try:
+            query_embedding = await self._get_embedding(query)
+            if query_embedding is None:
+                return []
+
+            def _query(collection):
+                return collection.query(
+                    query_embeddings=query_embedding[None, :],
+                    n_results=limit
+                )
+
+            results_list = await asyncio.gather(*[
+                asyncio.to_thread(_query, collections[ct])
+                for ct in collection_types if ct in collections
+            ], return_exceptions=True)
+
             parsed_results = []
-            if results["documents"]:
-                for i, doc in enumerate(results["documents"][0]):
-                    distance = results["distances"][0][i] if results["distances"] else 1.0
-                    # Convert distance to similarity (0 to 1, where 1 is identical)
-                    # Cosine distance: 0 is identical, 2 is opposite. 
-                    # Approximate similarity = 1 - distance (for normalized vectors)
-                    similarity = 1 - distance 
-                    logger.info(f"Candidate: '{doc[:30]}...' Sim: {similarity:.4f} vs Threshold: {self.similarity_threshold}")
-                    
-                    if similarity >= self.similarity_threshold:
-                        parsed_results.append({
-                            "content": doc,
-                            "metadata": results["metadatas"][0][i],
-                            "similarity": similarity
-                        })
-                        
-            return parsed_results
-            
+            for results in results_list:
+                if isinstance(results, Exception):
+                    logger.error(f"Error searching vector store: {results}")
+                    continue
+                parsed_results.extend(self._parse_query_results(results))
+
+            parsed_results.sort(key=lambda x: x["similarity"], reverse=True)
+            return parsed_results[:limit]
+
         except Exception as e:
             logger.error(f"Error searching vector store: {e}")
             return []
+
+    def _parse_query_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a raw Chroma query result into threshold-filtered dicts."""
+        parsed_results = []
+        if results["documents"]:
+            for i, doc in enumerate(results["documents"][0]):
+                distance = results["distances"][0][i] if results["distances"] else 1.0
+                # Convert distance to similarity (0 to 1, where 1 is identical)
+                # Cosine distance: 0 is identical, 2 is opposite.
+                # Approximate similarity = 1 - distance (for normalized vectors)
+                similarity = 1 - distance
+                logger.info(f"Candidate: '{doc[:30]}...' Sim: {similarity:.4f} vs Threshold: {self.similarity_threshold}")
+
+                if similarity >= self.similarity_threshold:
+                    parsed_results.append({
+                        "content": doc,
+                        "metadata": results["metadatas"][0][i],
+                        "similarity": similarity
+                    })
+
+        return parsed_results
@@ -3,6 +3,8 @@ Command Service for handling internal bot commands (Cron, Memory, Lights, Termin
 """
 import re
 import os
+import shlex
+import sys
 import logging
 from typing import List, Dict, Any, Pattern
 
@@ -22,15 +24,28 @@ class CommandService:
         self.events_file = os.path.join(config_dir, get_config("EVENTS_FILE"))
         self.terminal_service = TerminalService()
 
+        # Cron jobs run from the user's home, so the command must cd into the
+        # project and use the absolute python path. Both are invariant for the
+        # process lifetime, so build the prefix once.
+        self._cron_prefix = (
+            f'cd {shlex.quote(os.getcwd())} && '
+            f'{shlex.quote(sys.executable)} -m src.scripts.trigger_notification '
+        )
+
     async def process_commands(self, response_text: str, chat_id: int, context) -> bool:
         """
         Process commands embedded in LLM response.
         Returns True if any commands were processed.
         """
+        # Fast path: every command starts with ':::', and most replies
+        # contain none — one substring scan beats six regex sweeps
+        if ':::' not in response_text:
+            return False
+
         # Strip thinking tags to prevent executing commands from within <think> blocks
         response_text = re.sub(r'<think>.*?</think>', '', response_text, flags=re.DOTALL)
         response_text = re.sub(r'<think>.*', '', response_text, flags=re.DOTALL)
-        
+
         commands_processed = False
         
         # 1. Cron Delete
@@ -110,37 +125,9 @@ class CommandService:
                 continue
             
             schedule = f"{min_f} {hour_f} {day_f} {month_f} *"
-            
-            # Build command automatically from nombre
-            import shlex
-            import sys
-            
-            # Use the current python executable to run the script
-            python_exe = sys.executable
-            script_module = "src.scripts.trigger_notification"
-            
-            # Quote the message to be safe for shell
-            safe_nombre = shlex.quote(nombre)
-            
-            # The command that cron will execute
-            # We use the module execution properly
-            # We must ensure we are in the project root, so we cd there first? 
-            # Or we use absolute path.
-            # Let's assume the cron runs from user home or we provide full path.
-            # Safest is to use the full path to python and project root.
-            
-            # However, simpler if we just assume standard environment or RELATIVE if run from root.
-            # But cron runs from home usually.
-            # Let's use the PROJECT_ROOT we can infer or pass.
-            
-            # Actually, let's just use the absolute path to the project if possible.
-            # CommandService doesn't have PROJECT_ROOT handy unless we pass it.
-            # We can use os.getcwd() if we assume the bot is running from root when adding,
-            # but cron runs later.
-            
-            cwd = os.getcwd()
-            
-            base_command = f'cd {cwd} && {python_exe} -m {script_module} {safe_nombre}'
+
+            # Build command automatically from nombre (prefix precomputed in __init__)
+            base_command = self._cron_prefix + shlex.quote(nombre)
             
             if tipo == "unico":
                 from datetime import datetime
@@ -1,21 +1,80 @@
 """Critic module: Evaluates research quality and controls the loop."""
-import json
+import io
 import logging
 import re
 from typing import List, Optional, Tuple
 import uuid
 
+from src.services.deep_research.json_utils import json_loads, strip_code_fence
+from src.services.deep_research.llm_cache import get_llm_cache
 from src.services.deep_research.models import (
-    ResearchContext, 
-    ResearchTask, 
+    ResearchContext,
+    ResearchTask,
     TaskStatus,
     Chunk,
+    ChunkStore,
     GapAnalysis,
     IterationDecision
 )
 
 logger = logging.getLogger(__name__)
 
+# Static instruction blocks, kept byte-identical across calls so prefix-based
+# KV caching can reuse them. Dynamic fields go in the user message.
+EVALUATION_SYSTEM = """You are a Research Quality Critic. Evaluate if the collected information is sufficient to answer the task.
+
+Evaluate:
+1. Coverage: Does this cover all aspects of the task?
+2. Quality: Is the information reliable and detailed?
+3. Relevance: Are the chunks actually relevant to the task?
+
+Respond ONLY with a valid JSON object:
+{
+  "sufficient": true/false,
+  "reasoning": "detailed explanation of your evaluation",
+  "confidence": 0.0-1.0
+}
+
+Be strict. Only mark as sufficient if you have high-quality, comprehensive information."""
+
+FINAL_EVALUATION_SYSTEM = """You are a Final Research Evaluator. The research session is ending.
+
+Decide whether the original question can be answered comprehensively with the collected information.
+
+Respond ONLY with a valid JSON object:
+{
+  "sufficient": true/false,
+  "reasoning": "explanation",
+  "confidence": 0.0-1.0
+}"""
+
+GAP_ANALYSIS_SYSTEM = """You are a Gap Analysis Agent. The information collected is insufficient.
+
+Analyze what's missing and suggest specific search queries to find it.
+
+Respond ONLY with a valid JSON object:
+{
+  "missing_aspects": ["specific aspect 1", "specific aspect 2"],
+  "suggested_queries": ["query 1", "query 2"],
+  "reasoning": "why these aspects are missing and how to find them"
+}
+
+Guidelines:
+- Queries should be different from the original task query
+- Be specific about what's missing
+- Suggest 2-3 targeted queries"""
+
+FINAL_GAP_SYSTEM = """You are a Gap Analysis Agent. The research is ending but may be incomplete.
+
+Identify what critical information is still missing and suggest 2-3 focused search queries to find it.
+
+Respond ONLY with a valid JSON object:
+{
+  "missing_aspects": ["aspect 1", "aspect 2"],
+  "suggested_queries": ["query 1", "query 2", "query 3"],
+  "reasoning": "explanation"
+}"""
+
 
 class Critic:
     """Evaluates research progress and determines next steps."""
@@ -57,9 +116,9 @@ class Critic:
         
         # LLM-based evaluation
         prompt = self._create_evaluation_prompt(task, chunks, context)
-        
+
         try:
-            response = await self._get_llm_response(prompt, model)
+            response = await self._get_llm_response(prompt, model, system=EVALUATION_SYSTEM)
             evaluation = self._parse_evaluation_response(response)
             
             if evaluation["sufficient"]:
@@ -100,9 +159,9 @@ class Critic:
             Tuple of (should_continue, additional_tasks if should_continue)
         """
         prompt = self._create_final_evaluation_prompt(context)
-        
+
         try:
-            response = await self._get_llm_response(prompt, model)
+            response = await self._get_llm_response(prompt, model, system=FINAL_EVALUATION_SYSTEM)
             evaluation = self._parse_evaluation_response(response)
             
             if evaluation["sufficient"]:
@@ -127,9 +186,9 @@ class Critic:
     ) -> GapAnalysis:
         """Analyze what information is missing."""
         prompt = self._create_gap_analysis_prompt(task, chunks, evaluation_reasoning, context)
-        
+
         try:
-            response = await self._get_llm_response(prompt, model)
+            response = await self._get_llm_response(prompt, model, system=GAP_ANALYSIS_SYSTEM)
             # CORRECCIÓN: _parse_gap_response ya devuelve un objeto GapAnalysis.
             # No intentes acceder a él como si fuera un dict con .get()
             return self._parse_gap_response(response)
@@ -159,26 +218,14 @@ class Critic:
         model: str
     ) -> GapAnalysis:
         """Final gap analysis when research is incomplete."""
-        prompt = f"""You are a Gap Analysis Agent. The research is ending but may be incomplete.
-
-Original Question: {context.original_question}
+        prompt = f"""Original Question: {context.original_question}
 
 Total chunks collected: {len(context.chunks)}
 Iterations completed: {context.iteration_count}/{context.max_iterations}
 
-Previous evaluation: {reasoning}
-
-Identify what critical information is still missing and suggest 2-3 focused search queries to find it.
-
-Respond ONLY with a valid JSON object:
-{{
-  "missing_aspects": ["aspect 1", "aspect 2"],
-  "suggested_queries": ["query 1", "query 2", "query 3"],
-  "reasoning": "explanation"
-}}
-"""
+Previous evaluation: {reasoning}"""
         try:
-            response = await self._get_llm_response(prompt, model)
+            response = await self._get_llm_response(prompt, model, system=FINAL_GAP_SYSTEM)
             return self._parse_gap_response(response)
         except Exception as e:
             return GapAnalysis(
@@ -211,66 +258,45 @@ Respond ONLY with a valid JSON object:
         chunks: List[Chunk],
         context: ResearchContext
     ) -> str:
-        """Create evaluation prompt for a task."""
-        chunks_text = "\n\n".join([
-            f"Chunk {i+1} (relevance: {c.relevance_score}):\n{c.content[:300]}..."
-            for i, c in enumerate(chunks)
-        ])
-        
-        return f"""You are a Research Quality Critic. Evaluate if the collected information is sufficient to answer the task.
+        """Create the dynamic payload for evaluation (instructions are in EVALUATION_SYSTEM)."""
+        # Budget the chunk text (~4000 tokens) and spend it on the most
+        # relevant chunks shown in full, rather than slicing every chunk to
+        # 300 chars: cheaper prompt, better evaluation signal.
+        buf = io.StringIO()
+        remaining = 16000
+        ordered = ChunkStore(chunks).top_k(len(chunks))
+        for i, c in enumerate(ordered):
+            piece = c.content[:min(800, remaining)]
+            buf.write(f"Chunk {i+1} (relevance: {c.relevance_score}):\n{piece}\n\n")
+            remaining -= len(piece)
+            if remaining <= 0:
+                break
 
-Original Question: {context.original_question}
+        return f"""Original Question: {context.original_question}
 Task: {task.query}
 
 Collected Chunks ({len(chunks)}):
-{chunks_text}
-
-Evaluate:
-1. Coverage: Does this cover all aspects of the task?
-2. Quality: Is the information reliable and detailed?
-3. Relevance: Are the chunks actually relevant to the task?
-
-Respond ONLY with a valid JSON object:
-{{
-  "sufficient": true/false,
-  "reasoning": "detailed explanation of your evaluation",
-  "confidence": 0.0-1.0
-}}
-
-Be strict. Only mark as sufficient if you have high-quality, comprehensive information.
-"""
+{buf.getvalue().rstrip()}"""
     
     def _create_final_evaluation_prompt(self, context: ResearchContext) -> str:
-        """Create final evaluation prompt for entire research."""
+        """Create the dynamic payload for final evaluation (instructions are in FINAL_EVALUATION_SYSTEM)."""
         all_chunks = context.get_all_completed_chunks()
         chunks_summary = f"Total chunks: {len(all_chunks)}\n"
         chunks_summary += f"Tasks completed: {len([t for t in context.tasks if t.status == TaskStatus.COMPLETED])}/{len(context.tasks)}\n"
-        
-        # Sample of chunks
+
+        # Sample of the most relevant chunks
         sample = "\n\n".join([
             f"- {c.content[:200]}... (from: {c.source.title})"
-            for c in all_chunks[:5]
+            for c in ChunkStore(all_chunks).top_k(5)
         ])
-        
-        return f"""You are a Final Research Evaluator. The research session is ending.
 
-Original Question: {context.original_question}
+        return f"""Original Question: {context.original_question}
 
 Research Summary:
 {chunks_summary}
 
 Sample of collected information:
-{sample}
-
-Can the original question be answered comprehensively with this information?
-
-Respond ONLY with a valid JSON object:
-{{
-  "sufficient": true/false,
-  "reasoning": "explanation",
-  "confidence": 0.0-1.0
-}}
-"""
+{sample}"""
     
     def _create_gap_analysis_prompt(
         self,
@@ -279,30 +305,22 @@ Respond ONLY with a valid JSON object:
         evaluation_reasoning: str,
         context: ResearchContext
     ) -> str:
-        """Create gap analysis prompt."""
-        return f"""You are a Gap Analysis Agent. The information collected is insufficient.
-
-Task: {task.query}
-Evaluation: {evaluation_reasoning}
-
-Analyze what's missing and suggest specific search queries to find it.
-
-Respond ONLY with a valid JSON object:
-{{
-  "missing_aspects": ["specific aspect 1", "specific aspect 2"],
-  "suggested_queries": ["query 1", "query 2"],
-  "reasoning": "why these aspects are missing and how to find them"
-}}
-
-Guidelines:
-- Queries should be different from the original task query
-- Be specific about what's missing
-- Suggest 2-3 targeted queries
-"""
+        """Create the dynamic payload for gap analysis (instructions are in GAP_ANALYSIS_SYSTEM)."""
+        return f"""Task: {task.query}
+Evaluation: {evaluation_reasoning}"""
     
-    async def _get_llm_response(self, prompt: str, model: str) -> str:
-        """Get response from LLM."""
-        messages = [{"role": "user", "content": prompt}]
+    async def _get_llm_response(self, prompt: str, model: str, system: Optional[str] = None) -> str:
+        """Get response from LLM (static instructions as cacheable system prefix)."""
+        cache = get_llm_cache()
+        cached = cache.get(model, prompt, system or "")
+        if cached is not None:
+            logger.debug("LLM cache hit for critic prompt")
+            return cached
+
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
         full_response = ""
         
         async for chunk in self.client.stream_chat(model, messages):
@@ -323,7 +341,8 @@ Guidelines:
                     if json_match:
                         cleaned = json_match.group(1).strip()
                         break
-        
+
+        cache.set(model, prompt, system or "", cleaned)
         return cleaned
     
     def _parse_evaluation_response(self, response: str) -> dict:
@@ -331,13 +350,13 @@ Guidelines:
         response = self._clean_json_response(response)
         
         try:
-            data = json.loads(response)
+            data = json_loads(response)
             return {
                 "sufficient": data.get("sufficient", False),
                 "reasoning": data.get("reasoning", ""),
                 "confidence": data.get("confidence", 0.0)
             }
-        except json.JSONDecodeError:
+        except ValueError:
             logger.error(f"Failed to parse evaluation: {response[:200]}")
             return {"sufficient": False, "reasoning": "Parse error", "confidence": 0.0}
     
@@ -346,14 +365,14 @@ Guidelines:
         response = self._clean_json_response(response)
         
         try:
-            data = json.loads(response)
+            data = json_loads(response)
             return GapAnalysis(
                 has_gaps=True,
                 missing_aspects=data.get("missing_aspects", []),
                 suggested_queries=data.get("suggested_queries", []),
                 reasoning=data.get("reasoning", "")
             )
-        except json.JSONDecodeError:
+        except ValueError:
             logger.error(f"Failed to parse gap analysis: {response[:200]}")
             return GapAnalysis(
                 has_gaps=True,
@@ -364,11 +383,4 @@ Guidelines:
     
     def _clean_json_response(self, response: str) -> str:
         """Clean JSON response from markdown formatting."""
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        return response.strip()
+        return strip_code_fence(response)
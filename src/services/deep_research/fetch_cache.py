@@ -0,0 +1,161 @@
+"""Disk cache for fetched-and-extracted web content.
+
+Iterative research loops and retries revisit the same URLs; fetching runs a
+headless browser and markdown extraction is non-trivial CPU, so extracted
+text is cached on disk keyed by URL with a short TTL.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# One hour: long enough to cover a research session revisiting its source
+# set, short enough that fast-moving pages are refreshed between sessions.
+DEFAULT_TTL_SECONDS = 3600
+
+
+def _apply_cache_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    Tune a cache connection: WAL so readers don't serialize against the
+    batched writers, relaxed fsync (cache data is reconstructible), and
+    in-memory temp tables. Failures are ignored — old SQLite builds just
+    keep the defaults.
+    """
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+    except Exception as e:
+        logger.debug(f"Cache pragmas not applied: {e}")
+
+
+class FetchCache:
+    """
+    URL-keyed cache of extracted page text, backed by SQLite under the data
+    directory. Lookups never raise: any storage error degrades to a miss.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        if path is None:
+            from src.constants import DATA_DIR
+            path = os.path.join(DATA_DIR, "fetch_cache.db")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds
+        # check_same_thread=False: async wrappers run DB work in worker
+        # threads via asyncio.to_thread; the lock serializes access
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        _apply_cache_pragmas(self._conn)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, content TEXT, fetched REAL)"
+        )
+        self._conn.commit()
+
+        # Write-behind buffer: stores queue up here and land in one
+        # transaction, so a burst of concurrent fetches pays one commit
+        # instead of one per page
+        self._pending: Dict[str, tuple] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the cached extracted text, or None on miss/expiry/error."""
+        pending = self._pending.get(self._key(url))
+        if pending is not None:
+            return pending[0]
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT content, fetched FROM pages WHERE key = ?",
+                    (self._key(url),)
+                ).fetchone()
+            if row is None:
+                return None
+            content, fetched = row
+            if time.time() - fetched > self.ttl_seconds:
+                return None
+            return content
+        except Exception as e:
+            logger.warning(f"Fetch cache lookup failed: {e}")
+            return None
+
+    def set(self, url: str, content: str) -> None:
+        """Store extracted text; empty content is not cached."""
+        if not content:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (key, content, fetched) VALUES (?, ?, ?)",
+                    (self._key(url), content, time.time())
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Fetch cache store failed: {e}")
+
+    # ── Async wrappers (event-loop friendly) ─────────────────────────
+
+    async def get_async(self, url: str) -> Optional[str]:
+        """Like get(), but runs the disk read in a worker thread."""
+        pending = self._pending.get(self._key(url))
+        if pending is not None:
+            return pending[0]
+        return await asyncio.to_thread(self.get, url)
+
+    def set_async(self, url: str, content: str) -> None:
+        """
+        Queue a store and return immediately; pending entries are flushed
+        in one transaction shortly after, off the event loop.
+        """
+        if not content:
+            return
+        self._pending[self._key(url)] = (content, time.time())
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        """Give concurrent fetches a moment to queue, then flush the batch."""
+        await asyncio.sleep(0.1)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending entries in a single transaction."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+
+        def _write() -> None:
+            try:
+                with self._lock:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO pages (key, content, fetched) VALUES (?, ?, ?)",
+                        [(key, content, fetched) for key, (content, fetched) in batch.items()]
+                    )
+                    self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Fetch cache flush failed: {e}")
+
+        await asyncio.to_thread(_write)
+
+
+_shared_cache: Optional[FetchCache] = None
+
+
+def get_fetch_cache() -> FetchCache:
+    """Get the shared fetch cache instance."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = FetchCache()
+    return _shared_cache
@@ -1,6 +1,8 @@
 """Hunter module: Searches for relevant sources."""
+import asyncio
 import logging
-from typing import List
+from typing import Dict, List
+from urllib.parse import urlsplit, urlunsplit
 
 from src.services.deep_research.models import ResearchTask, Source
 from utils.search_utils import WebSearch
@@ -8,6 +10,28 @@ from utils.search_utils import WebSearch
 logger = logging.getLogger(__name__)
 
 
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for deduplication: lowercase scheme/host, drop utm_*
+    tracking params, trailing slash and fragment.
+    """
+    try:
+        parts = urlsplit(url)
+        query = "&".join(
+            p for p in parts.query.split("&")
+            if p and not p.lower().startswith("utm_")
+        )
+        return urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            query,
+            ""
+        ))
+    except Exception:
+        return url
+
+
 class Hunter:
     """Finds relevant web sources for a given research task."""
     
@@ -27,53 +51,65 @@ class Hunter:
         logger.info(f"Hunter searching for task: {task.query}")
         
         try:
-            # Use Web Search API
-            search_results = await WebSearch.search(
+            # Use Web Search API (structured results: no string re-parsing)
+            search_results = await WebSearch.search_structured(
                 query=task.query,
                 count=self.search_count
             )
-            
-            # Parse results and create Source objects
+
             sources = self._parse_search_results(search_results, task.id)
-            
+
             logger.info(f"Hunter found {len(sources)} sources for task {task.id}")
             return sources
             
         except Exception as e:
             logger.error(f"Error in hunter for task {task.id}: {e}")
             return []
-    
-    def _parse_search_results(self, results: str, task_id: str) -> List[Source]:
-        """Parse SearXNG Search results into Source objects."""
-        sources = []
-        
-        if not results or results.startswith("[") or results.startswith("No results"):
-            return sources
-        
-        # Parse the formatted results from WebSearch
-        # Format: "1. **Title**\n   Description\n   URL"
-        entries = results.split("\n\n")
-        
-        for entry in entries:
-            lines = entry.strip().split("\n")
-            if len(lines) >= 3:
-                # Extract title (remove number prefix and bold markers)
-                title_line = lines[0]
-                title = title_line.split(". ", 1)[-1] if ". " in title_line else title_line
-                title = title.replace("**", "").strip()
-                
-                # Extract description
-                description = lines[1].strip()
-                
-                # Extract URL
-                url = lines[2].strip()
-                
-                source = Source(
-                    url=url,
-                    title=title,
-                    description=description,
-                    task_id=task_id
-                )
-                sources.append(source)
-        
-        return sources
+
+    async def hunt_many(
+        self,
+        tasks: List[ResearchTask],
+        max_concurrent: int = 5
+    ) -> Dict[str, List[Source]]:
+        """
+        Search for several tasks concurrently.
+
+        Searches are pure IO-bound HTTP, so running them in parallel shrinks
+        total hunt latency from the sum of round-trips to the slowest one.
+        A semaphore bounds in-flight requests to respect search rate limits.
+
+        Args:
+            tasks: Research tasks to search for
+            max_concurrent: Maximum concurrent search requests
+
+        Returns:
+            Mapping of task id to the sources found for it
+        """
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def _one(task: ResearchTask) -> List[Source]:
+            async with sem:
+                return await self.hunt(task)
+
+        results = await asyncio.gather(*map(_one, tasks), return_exceptions=True)
+
+        sources_by_task = {}
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error in hunter for task {task.id}: {result}")
+                sources_by_task[task.id] = []
+            else:
+                sources_by_task[task.id] = result
+        return sources_by_task
+
+    def _parse_search_results(self, results: List[dict], task_id: str) -> List[Source]:
+        """Build Source objects from structured SearXNG results."""
+        return [
+            Source(
+                url=r["url"],
+                title=r["title"],
+                description=r["description"],
+                task_id=task_id
+            )
+            for r in results if r.get("url")
+        ]
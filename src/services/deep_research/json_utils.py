@@ -0,0 +1,28 @@
+"""JSON helpers for deep-research parsing paths.
+
+LLM extraction responses can be tens of KB; orjson parses them several
+times faster than stdlib json, so it is used when installed. Both parsers
+raise ValueError subclasses on bad input, so callers catch ValueError.
+"""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Leading/trailing markdown code fences (``` or ```json), in one pass
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def strip_code_fence(response: str) -> str:
+    """Strip markdown code fences from an LLM response in a single sub."""
+    return _FENCE_RE.sub('', response).strip()
@@ -0,0 +1,92 @@
+"""Response cache for deep-research LLM calls.
+
+Planner, Critic and Reader responses are pure functions of (model, prompt),
+so repeated or retried calls (same question asked twice, same chunk-set
+re-evaluated) can be answered from a local store instead of hitting the LLM.
+Entries expire after a TTL so stale plans don't linger.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from src.services.deep_research.fetch_cache import _apply_cache_pragmas
+
+logger = logging.getLogger(__name__)
+
+# Two weeks: long enough to survive a research session and retries,
+# short enough that outdated answers age out.
+DEFAULT_TTL_SECONDS = 14 * 24 * 3600
+
+
+class LLMCache:
+    """
+    Exact-match cache keyed on sha256(model + system + prompt).
+
+    Backed by a small SQLite database under the data directory. Only
+    non-empty responses are stored, and lookups never raise: any storage
+    error degrades to a cache miss.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        if path is None:
+            from src.constants import DATA_DIR
+            path = os.path.join(DATA_DIR, "llm_cache.db")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.ttl_seconds = ttl_seconds
+        self._conn = sqlite3.connect(path)
+        _apply_cache_pragmas(self._conn)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT, created REAL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(model: str, prompt: str, system: str) -> str:
+        raw = "\x00".join((model, system, prompt))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str, system: str = "") -> Optional[str]:
+        """Return the cached response, or None on miss/expiry/error."""
+        try:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?",
+                (self._key(model, prompt, system),)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if time.time() - created > self.ttl_seconds:
+                return None
+            return response
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+
+    def set(self, model: str, prompt: str, system: str, response: str) -> None:
+        """Store a response; empty responses are not cached."""
+        if not response:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                (self._key(model, prompt, system), response, time.time())
+            )
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+
+
+_shared_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the cache instance shared by Planner, Critic and Reader."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = LLMCache()
+    return _shared_cache
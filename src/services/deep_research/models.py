@@ -4,6 +4,8 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+import numpy as np
+
 
 class TaskStatus(Enum):
     PENDING = "pending"
@@ -38,6 +40,39 @@ class Chunk:
     task_id: str
 
 
+class ChunkStore:
+    """
+    Column-wise view over a chunk list for vectorized filtering.
+
+    Relevance scores live in one contiguous float32 array, so threshold
+    masks and top-k selection run as numpy operations instead of per-object
+    attribute hops. The Chunk objects stay authoritative; this is a view.
+    """
+
+    def __init__(self, chunks: List["Chunk"]):
+        self.chunks = list(chunks)
+        self.relevance = np.asarray(
+            [c.relevance_score for c in self.chunks], dtype=np.float32
+        )
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def filter_by_relevance(self, threshold: float) -> List["Chunk"]:
+        """Chunks with relevance >= threshold (branchless numpy mask)."""
+        idxs = np.nonzero(self.relevance >= threshold)[0]
+        return [self.chunks[i] for i in idxs]
+
+    def top_k(self, k: int) -> List["Chunk"]:
+        """The k most relevant chunks, best first (argpartition, not full sort)."""
+        if k >= len(self.chunks):
+            order = np.argsort(self.relevance)[::-1]
+        else:
+            part = np.argpartition(self.relevance, -k)[-k:]
+            order = part[np.argsort(self.relevance[part])[::-1]]
+        return [self.chunks[i] for i in order]
+
+
 @dataclass
 class ResearchTask:
     """Represents a sub-task generated by the Planner."""
@@ -72,7 +107,33 @@ class ResearchContext:
     max_iterations: int = 15
     current_depth: int = 0
     max_depth: int = 5
-    
+    # Column of relevance scores parallel to `chunks`, maintained by
+    # add_chunks(): ranking over the session's full chunk set is a numpy
+    # operation instead of a per-object attribute walk
+    _scores: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float32), repr=False
+    )
+
+    def add_chunks(self, new_chunks: List[Chunk]) -> None:
+        """Append chunks, keeping the score column in sync."""
+        if not new_chunks:
+            return
+        self.chunks.extend(new_chunks)
+        self._scores = np.concatenate([
+            self._scores,
+            np.asarray([c.relevance_score for c in new_chunks], dtype=np.float32),
+        ])
+
+    def top_k(self, k: int, min_relevance: float = 0.0) -> List[Chunk]:
+        """The k most relevant chunks at or above min_relevance, best first."""
+        idxs = np.nonzero(self._scores >= min_relevance)[0]
+        scores = self._scores[idxs]
+        if k < len(idxs):
+            part = np.argpartition(scores, -k)[-k:]
+            idxs, scores = idxs[part], scores[part]
+        order = idxs[np.argsort(scores)[::-1]]
+        return [self.chunks[i] for i in order]
+
     def get_pending_tasks(self) -> List[ResearchTask]:
         """Get all pending tasks sorted by priority."""
         return sorted(
@@ -1,4 +1,5 @@
 """Orchestrator: Coordinates the entire Deep Research workflow."""
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional, Callable, Any
@@ -10,7 +11,7 @@ from src.services.deep_research.models import (
     IterationDecision
 )
 from src.services.deep_research.planner import Planner
-from src.services.deep_research.hunter import Hunter
+from src.services.deep_research.hunter import Hunter, normalize_url
 from src.services.deep_research.reader import Reader
 from src.services.deep_research.critic import Critic
 from src.services.deep_research.writer import Writer
@@ -88,7 +89,17 @@ class DeepResearchOrchestrator:
         
         # PHASE 2: EXECUTE RESEARCH LOOP
         await self._notify(f"🔍 Phase 2: Executing research loop (max {self.max_iterations} iterations)...")
-        
+
+        # URLs already fetched this session (normalized); tasks often surface
+        # the same pages, and re-fetching + re-extracting them is pure waste
+        seen_urls = set()
+
+        # Hunt results fetched speculatively for upcoming tasks (task id →
+        # sources): web search is network-bound while reading is LLM-bound,
+        # so hunting batch N+1 overlaps with reading batch N
+        prefetched = {}
+        prefetch_task = None
+
         while context.iteration_count < self.max_iterations:
             pending_tasks = context.get_pending_tasks()
             
@@ -107,21 +118,76 @@ class DeepResearchOrchestrator:
             batch = pending_tasks[:batch_size]
             
             await self._notify(f"🚀 Processing {len(batch)} tasks...")
-            
-            # Process tasks sequentially — local models can only handle
-            # one LLM request at a time
+
+            # Hunt sources for the whole batch concurrently (pure IO), then
+            # process tasks sequentially — local models can only handle
+            # one LLM request at a time. Tasks hunted speculatively during
+            # the previous batch skip straight to reading.
+            to_hunt = [t for t in batch if t.id not in prefetched]
+            if to_hunt:
+                await self._notify(f"  → Searching web for {len(to_hunt)} tasks...")
+                sources_by_task = await self.hunter.hunt_many(to_hunt)
+            else:
+                sources_by_task = {}
+            for task in batch:
+                if task.id in prefetched:
+                    sources_by_task[task.id] = prefetched.pop(task.id)
+
+            # Speculatively hunt the next batch while this one is being read:
+            # the search round-trips run during the LLM's compute time
+            upcoming = [
+                t for t in pending_tasks[batch_size:batch_size + self.concurrent_tasks]
+                if t.id not in prefetched
+            ]
+            if upcoming:
+                prefetch_task = asyncio.create_task(self.hunter.hunt_many(upcoming))
+
             for task in batch:
                 context.iteration_count += 1
-                await self._process_task(task, context, context.iteration_count)
+
+                # Deduplicate against URLs already processed for other tasks
+                sources = sources_by_task.get(task.id, [])
+                fresh_sources = []
+                for source in sources:
+                    key = normalize_url(source.url)
+                    if key in seen_urls:
+                        continue
+                    seen_urls.add(key)
+                    fresh_sources.append(source)
+
+                if sources and not fresh_sources:
+                    # Every source was already covered by a previous task;
+                    # its chunks are in the context, so nothing new to do.
+                    task.status = TaskStatus.COMPLETED
+                    task.completed_at = datetime.now()
+                    await self._notify(f"  ✓ Sources for '{task.query[:40]}...' already covered")
+                    continue
+
+                await self._process_task(
+                    task, context, context.iteration_count,
+                    sources=fresh_sources
+                )
             
+            # Collect the speculative hunt (usually done by now — the batch
+            # above spent its time on LLM calls)
+            if prefetch_task is not None:
+                try:
+                    prefetched.update(await prefetch_task)
+                except Exception as e:
+                    logger.error(f"Speculative hunt failed: {e}")
+                prefetch_task = None
+
             # Notify iteration progress
             await self._notify(f"📊 Progress: {context.iteration_count}/{self.max_iterations} iterations completed")
-            
+
             # Check if we should continue or have enough information
             if context.iteration_count >= self.max_iterations:
                 await self._notify(f"⏱️ Reached maximum iterations ({self.max_iterations})")
                 break
-        
+
+        if prefetch_task is not None and not prefetch_task.done():
+            prefetch_task.cancel()
+
         # PHASE 3: FINAL EVALUATION (if needed)
         if context.iteration_count >= self.max_iterations:
             await self._notify("🔍 Phase 3: Final evaluation...")
@@ -130,12 +196,17 @@ class DeepResearchOrchestrator:
             if should_continue and additional_tasks:
                 await self._notify(f"⚠️ Adding {len(additional_tasks)} emergency tasks...")
                 context.tasks.extend(additional_tasks)
-                
-                # Process emergency tasks
-                for task in additional_tasks:
-                    if context.iteration_count < self.max_iterations:
-                        context.iteration_count += 1
-                        await self._process_task(task, context, context.iteration_count)
+
+                # Process emergency tasks: hunt the whole set concurrently
+                # (same bounded fan-out as the main loop), read serially
+                runnable = additional_tasks[:max(0, self.max_iterations - context.iteration_count)]
+                emergency_sources = await self.hunter.hunt_many(runnable) if runnable else {}
+                for task in runnable:
+                    context.iteration_count += 1
+                    await self._process_task(
+                        task, context, context.iteration_count,
+                        sources=emergency_sources.get(task.id)
+                    )
         
         # PHASE 4: WRITING
         await self._notify("📝 Phase 4: Synthesizing report...")
@@ -145,14 +216,26 @@ class DeepResearchOrchestrator:
         
         return context
     
-    async def _process_task(self, task: ResearchTask, context: ResearchContext, iteration_number: int):
-        """Process a single research task through the full pipeline."""
+    async def _process_task(
+        self,
+        task: ResearchTask,
+        context: ResearchContext,
+        iteration_number: int,
+        sources: Optional[list] = None
+    ):
+        """Process a single research task through the full pipeline.
+
+        Args:
+            sources: Pre-fetched sources from a batched hunt; if None,
+                the hunter is called here.
+        """
         await self._notify(f"🔍 Iteration {iteration_number}/{self.max_iterations}: {task.query[:50]}...")
         task.status = TaskStatus.IN_PROGRESS
-        
-        # Step 1: Hunt for sources
-        await self._notify(f"  → Searching web...")
-        sources = await self.hunter.hunt(task)
+
+        # Step 1: Hunt for sources (unless already hunted for the batch)
+        if sources is None:
+            await self._notify(f"  → Searching web...")
+            sources = await self.hunter.hunt(task)
         
         if not sources:
             await self._notify(f"  ⚠️ No sources found for: {task.query[:40]}...")
@@ -172,7 +255,7 @@ class DeepResearchOrchestrator:
             return
         
         task.chunks_extracted = chunks
-        context.chunks.extend(chunks)
+        context.add_chunks(chunks)
         await self._notify(f"  ✓ Extracted {len(chunks)} relevant chunks")
         
         # Step 3: Critic evaluation
@@ -1,14 +1,45 @@
 """Planner module: Decomposes user questions into sub-tasks."""
-import json
 import logging
 import re
 from typing import List, Dict, Any
 import uuid
 
+from src.services.deep_research.json_utils import json_loads, strip_code_fence
+from src.services.deep_research.llm_cache import get_llm_cache
 from src.services.deep_research.models import ResearchTask, TaskStatus
 
 logger = logging.getLogger(__name__)
 
+# Static instruction block, kept byte-identical across calls so prefix-based
+# KV caching (local llama.cpp/vLLM or hosted providers) can reuse it.
+# Dynamic fields go in the user message, after this prefix.
+PLANNING_SYSTEM = """You are a Research Planning Agent. Your task is to decompose a complex research question into specific, actionable sub-tasks.
+
+Break the question down into 3-7 specific sub-tasks or sub-questions that need to be investigated to fully answer the original question.
+
+For each sub-task, provide:
+1. A specific search query (use keywords, not full sentences)
+2. A priority (1 = highest priority, higher numbers = lower priority)
+
+Respond ONLY with a valid JSON array in this format:
+[
+  {
+    "query": "keywords for search",
+    "priority": 1
+  },
+  {
+    "query": "another search query",
+    "priority": 2
+  }
+]
+
+Guidelines:
+- Queries should be keyword-based for better search results
+- Cover different aspects of the topic
+- Order by logical dependency (some questions may need to be answered first)
+- Be specific, not vague
+- Maximum 7 sub-tasks"""
+
 
 class Planner:
     """Breaks down complex research questions into manageable sub-tasks."""
@@ -57,40 +88,21 @@ class Planner:
             )]
     
     def _create_planning_prompt(self, question: str) -> str:
-        """Create the planning prompt for the LLM."""
-        return f"""You are a Research Planning Agent. Your task is to decompose a complex research question into specific, actionable sub-tasks.
-
-Original Question: {question}
+        """Create the dynamic part of the planning prompt (instructions are in PLANNING_SYSTEM)."""
+        return f"Original Question: {question}"
 
-Break this down into 3-7 specific sub-tasks or sub-questions that need to be investigated to fully answer the original question.
-
-For each sub-task, provide:
-1. A specific search query (use keywords, not full sentences)
-2. A priority (1 = highest priority, higher numbers = lower priority)
-
-Respond ONLY with a valid JSON array in this format:
-[
-  {{
-    "query": "keywords for search",
-    "priority": 1
-  }},
-  {{
-    "query": "another search query",
-    "priority": 2
-  }}
-]
-
-Guidelines:
-- Queries should be keyword-based for better search results
-- Cover different aspects of the topic
-- Order by logical dependency (some questions may need to be answered first)
-- Be specific, not vague
-- Maximum 7 sub-tasks
-"""
-    
     async def _get_llm_response(self, prompt: str, model: str) -> str:
-        """Get response from LLM."""
-        messages = [{"role": "user", "content": prompt}]
+        """Get response from LLM (static instructions as cacheable system prefix)."""
+        cache = get_llm_cache()
+        cached = cache.get(model, prompt, PLANNING_SYSTEM)
+        if cached is not None:
+            logger.debug("LLM cache hit for planning prompt")
+            return cached
+
+        messages = [
+            {"role": "system", "content": PLANNING_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
         full_response = ""
         
         async for chunk in self.client.stream_chat(model, messages):
@@ -110,23 +122,16 @@ Guidelines:
                     if json_match:
                         cleaned = json_match.group(1).strip()
                         break
-        
+
+        cache.set(model, prompt, PLANNING_SYSTEM, cleaned)
         return cleaned
     
     def _parse_plan_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse JSON response from LLM."""
-        # Clean up response
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        response = response.strip()
-        
+        response = strip_code_fence(response)
+
         try:
-            data = json.loads(response)
+            data = json_loads(response)
             if isinstance(data, list):
                 return data
             elif isinstance(data, dict) and "tasks" in data:
@@ -134,6 +139,6 @@ Guidelines:
             else:
                 logger.warning(f"Unexpected response format: {data}")
                 return []
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse JSON: {e}\nResponse: {response[:200]}")
             return []
@@ -1,16 +1,125 @@
 """Reader module: Extracts relevant content from sources."""
 import asyncio
-import json
 import logging
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
+import numpy as np
+
+from src.services.deep_research.fetch_cache import get_fetch_cache
+from src.services.deep_research.json_utils import json_loads, strip_code_fence
+from src.services.deep_research.llm_cache import get_llm_cache
 from src.services.deep_research.models import Source, Chunk
 from utils.web_fetcher import WebFetcher
 
 logger = logging.getLogger(__name__)
 
+# Pre-compiled patterns for the per-extraction hot path
+_THINK_CLOSED = re.compile(r'<think>.*?</think>', re.DOTALL)
+_THINK_OPEN = re.compile(r'<think>.*', re.DOTALL)
+
+
+@lru_cache(maxsize=32)
+def _extraction_prefix(task_query: str) -> str:
+    """Prompt prefix bound to a task query, rendered once per task.
+
+    One research task reads dozens of sources with the same query; caching
+    the prefix means per-source prompt building only formats the fields
+    that actually change (title, URL, content).
+    """
+    return f"Task Query: {task_query}\n"
+
+
+def _find_json_array(text: str) -> Optional[str]:
+    """
+    Find the first balanced top-level JSON array in text with one pass.
+
+    Walks the string tracking in-string/escape state so brackets inside
+    string values don't count, and returns the balanced [...] substring.
+    Used to salvage JSON from chain-of-thought output, replacing several
+    regex scans over responses that can run to tens of KB.
+    """
+    start = text.find('[')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '[':
+            depth += 1
+        elif ch == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+# Static instruction blocks, kept byte-identical across calls so prefix-based
+# KV caching can reuse them. Dynamic fields go in the user message.
+EXTRACTION_SYSTEM = """You are a Content Extraction Agent. Your task is to extract relevant information from web content. Respond ONLY with valid JSON. Do not think out loud or explain.
+
+Extract the most relevant information chunks that answer the task query.
+Each chunk should be a complete, self-contained piece of information.
+
+Respond ONLY with a valid JSON array in this format:
+[
+  {
+    "content": "The extracted text chunk with relevant information",
+    "relevance": 0.95
+  },
+  {
+    "content": "Another relevant chunk",
+    "relevance": 0.85
+  }
+]
+
+Guidelines:
+- Relevance score: 0.0 to 1.0 (1.0 = highly relevant)
+- Extract only substantial information, not fluff
+- Each chunk should be 1-3 sentences or a short paragraph
+- Maximum 5 chunks per source
+- If content is not relevant, return empty array []"""
+
+BATCH_EXTRACTION_SYSTEM = """You are a Content Extraction Agent. Your task is to extract relevant information from multiple web documents. Respond ONLY with valid JSON. Do not think out loud or explain.
+
+Extract the most relevant information chunks that answer the task query.
+Each chunk should be a complete, self-contained piece of information.
+
+Respond ONLY with a valid JSON array in this format:
+[
+  {
+    "doc": 0,
+    "content": "The extracted text chunk with relevant information",
+    "relevance": 0.95
+  },
+  {
+    "doc": 1,
+    "content": "Another relevant chunk",
+    "relevance": 0.85
+  }
+]
+
+Guidelines:
+- "doc" is the number of the document the chunk was extracted from
+- Relevance score: 0.0 to 1.0 (1.0 = highly relevant)
+- Extract only substantial information, not fluff
+- Each chunk should be 1-3 sentences or a short paragraph
+- Maximum 5 chunks per document
+- If no document is relevant, return empty array []"""
+
 
 class Reader:
     """Reads and extracts relevant content chunks from web sources."""
@@ -20,14 +129,30 @@ class Reader:
         llm_client,
         min_relevance: float = 0.7,
         max_concurrent: int = 3,
-        fetch_delay: float = 1.0
+        fetch_delay: float = 1.0,
+        max_concurrent_llm: int = 1
     ):
         self.client = llm_client
         self.min_relevance = min_relevance
         self.fetcher = WebFetcher()
         self.max_concurrent = max_concurrent
         self.fetch_delay = fetch_delay
-    
+        # 1 for local backends (Ollama/LM Studio handle one request at a
+        # time); raise to 8-16 for hosted providers to overlap network RTT
+        self.max_concurrent_llm = max_concurrent_llm
+
+    # Batch extraction limits: per-document truncation and total content
+    # packed into one prompt (keeps the batch inside the context window)
+    DOC_CONTENT_LIMIT = 4000
+    BATCH_CONTENT_BUDGET = 16000
+
+    # Single-document prompt budget
+    EXTRACTION_CONTENT_LIMIT = 8000
+
+    # Chunks whose content cosine exceeds this against a better-ranked
+    # chunk are considered near-duplicates and dropped
+    DEDUP_SIMILARITY = 0.92
+
     async def read_sources(
         self, 
         sources: List[Source], 
@@ -60,35 +185,238 @@ class Reader:
         fetch_tasks = [fetch_one(s) for s in sources]
         fetched = await asyncio.gather(*fetch_tasks, return_exceptions=True)
         
-        # PHASE 2: LLM extraction — ONE AT A TIME (local model limitation)
+        # PHASE 2: LLM extraction — batched. The workload is latency-bound on
+        # LLM round-trips, so pack several sources into one multi-document
+        # prompt instead of one request per source. Shards keep each prompt
+        # inside the context window and run concurrently up to
+        # max_concurrent_llm in-flight requests (1 = serial, for local models).
+        pairs = []
         for result in fetched:
             if isinstance(result, Exception):
                 logger.error(f"Fetch failed: {result}")
                 continue
-            
-            source, content = result
-            try:
-                extracted = await self._extract_relevant_chunks(
-                    content=content,
-                    source=source,
-                    task_query=task_query,
-                    model=model
-                )
-                chunks.extend(extracted)
-                logger.info(f"Extracted {len(extracted)} chunks from {source.url}")
-            except Exception as e:
-                logger.error(f"Extraction error for {source.url}: {e}")
-                # Fallback: use raw content as a chunk
+            pairs.append(result)
+
+        sem = asyncio.Semaphore(self.max_concurrent_llm)
+
+        async def extract_shard(shard: List[tuple]) -> List[Chunk]:
+            """Extract one shard under the LLM concurrency limit."""
+            async with sem:
+                try:
+                    extracted = await self._extract_batch(shard, task_query, model)
+                    logger.info(f"Extracted {len(extracted)} chunks from batch of {len(shard)} sources")
+                    return extracted
+                except Exception as e:
+                    logger.error(f"Batch extraction error: {e}")
+                    # Fallback: per-source extraction for this shard
+                    fallback = []
+                    for source, content in shard:
+                        try:
+                            fallback.extend(await self._extract_relevant_chunks(
+                                content=content,
+                                source=source,
+                                task_query=task_query,
+                                model=model
+                            ))
+                        except Exception as e2:
+                            logger.error(f"Extraction error for {source.url}: {e2}")
+                            # Last resort: use raw content as a chunk
+                            fallback.append(Chunk(
+                                content=content[:2000] if content else source.description,
+                                source=source,
+                                relevance_score=0.5,
+                                extracted_at=datetime.now(),
+                                task_id=source.task_id
+                            ))
+                    return fallback
+
+        shard_results = await asyncio.gather(
+            *[extract_shard(shard) for shard in self._shard_sources(pairs)]
+        )
+        for extracted in shard_results:
+            chunks.extend(extracted)
+
+        # PHASE 3: embedding-based rerank + near-duplicate suppression
+        chunks = await self._rerank_and_dedup(chunks, task_query)
+
+        logger.info(f"Reader extracted {len(chunks)} chunks from {len(sources)} sources")
+        return chunks
+
+    async def _rerank_and_dedup(self, chunks: List[Chunk], task_query: str) -> List[Chunk]:
+        """
+        Score chunks against the query with embedding cosines and drop
+        near-duplicates.
+
+        Uses the RAG embedding model already configured for the bot; the
+        cosine is combined with the LLM's self-reported relevance (max of
+        the two) and chunks nearly identical to a better-ranked chunk are
+        suppressed. Any failure leaves the chunk list untouched.
+        """
+        if len(chunks) < 2:
+            return chunks
+
+        try:
+            from utils.config_loader import get_config
+            rag_cfg = get_config("RAG", {})
+            model = rag_cfg.get("EMBEDDING_MODEL") if isinstance(rag_cfg, dict) else None
+            if not model:
+                return chunks
+
+            query_vec = await self.client.generate_embedding(model, task_query)
+            if not query_vec:
+                return chunks
+
+            vecs = []
+            for chunk in chunks:
+                vec = await self.client.generate_embedding(model, chunk.content)
+                if not vec:
+                    return chunks
+                vecs.append(vec)
+
+            C = np.asarray(vecs, dtype=np.float32)
+            q = np.asarray(query_vec, dtype=np.float32)
+            C /= np.linalg.norm(C, axis=1, keepdims=True) + 1e-8
+            q /= np.linalg.norm(q) + 1e-8
+
+            sims = C @ q
+            for chunk, sim in zip(chunks, sims):
+                chunk.relevance_score = max(chunk.relevance_score, float(sim))
+
+            # Greedy suppression: walk chunks best-first, keep a chunk only
+            # if it isn't a near-duplicate of anything already kept
+            sim_matrix = C @ C.T
+            order = np.argsort([-c.relevance_score for c in chunks])
+            kept = []
+            for i in order:
+                if all(sim_matrix[i, j] <= self.DEDUP_SIMILARITY for j in kept):
+                    kept.append(i)
+
+            if len(kept) < len(chunks):
+                logger.info(f"Dropped {len(chunks) - len(kept)} near-duplicate chunks")
+
+            kept.sort()
+            return [chunks[i] for i in kept]
+
+        except Exception as e:
+            logger.warning(f"Embedding rerank/dedup skipped: {e}")
+            return chunks
+
+    def _truncate_to_budget(self, content: str, task_query: str, limit: int) -> str:
+        """
+        Fit content into the prompt budget, keeping the most relevant parts.
+
+        Blind head-truncation throws away whatever happens to be past the
+        cutoff; instead, over-long content is split into paragraphs, each
+        scored by query-term density, and the best ones are greedily packed
+        into the budget in document order. Falls back to head truncation
+        when the content has no structure or no query terms match.
+        """
+        if len(content) <= limit:
+            return content
+
+        terms = {t for t in re.findall(r'\w+', task_query.lower()) if len(t) > 3}
+        paragraphs = [p for p in content.split('\n\n') if p.strip()]
+        if not terms or len(paragraphs) < 2:
+            return content[:limit]
+
+        def density(paragraph: str) -> float:
+            words = re.findall(r'\w+', paragraph.lower())
+            if not words:
+                return 0.0
+            return sum(1 for w in words if w in terms) / len(words)
+
+        ranked = sorted(
+            range(len(paragraphs)),
+            key=lambda i: density(paragraphs[i]),
+            reverse=True
+        )
+        picked = []
+        used = 0
+        for i in ranked:
+            cost = len(paragraphs[i]) + 2
+            if used + cost > limit:
+                continue
+            picked.append(i)
+            used += cost
+
+        if not picked:
+            return content[:limit]
+        picked.sort()
+        return '\n\n'.join(paragraphs[i] for i in picked)
+
+    def _shard_sources(self, pairs: List[tuple]) -> List[List[tuple]]:
+        """Split (source, content) pairs into shards that fit one batch prompt."""
+        shards = []
+        current, used = [], 0
+        for source, content in pairs:
+            doc_len = min(len(content or ""), self.DOC_CONTENT_LIMIT)
+            if current and used + doc_len > self.BATCH_CONTENT_BUDGET:
+                shards.append(current)
+                current, used = [], 0
+            current.append((source, content))
+            used += doc_len
+        if current:
+            shards.append(current)
+        return shards
+
+    async def _extract_batch(
+        self,
+        pairs: List[tuple],
+        task_query: str,
+        model: str
+    ) -> List[Chunk]:
+        """Extract chunks from several sources in a single LLM round-trip."""
+        if len(pairs) == 1:
+            source, content = pairs[0]
+            return await self._extract_relevant_chunks(
+                content=content,
+                source=source,
+                task_query=task_query,
+                model=model
+            )
+
+        prompt = self._create_batch_extraction_prompt(pairs, task_query)
+        response = await self._get_llm_response(prompt, model, system=BATCH_EXTRACTION_SYSTEM)
+        logger.debug(f"Batch extraction response: {response[:500]}")
+        chunks_data = self._parse_extraction_response(response)
+
+        chunks = []
+        for chunk_data in chunks_data:
+            if not isinstance(chunk_data, dict) or "content" not in chunk_data:
+                continue
+
+            doc_index = chunk_data.get("doc")
+            if not isinstance(doc_index, int) or not (0 <= doc_index < len(pairs)):
+                continue
+
+            relevance = chunk_data.get("relevance", 0.5)
+            if relevance >= self.min_relevance:
+                source = pairs[doc_index][0]
                 chunks.append(Chunk(
-                    content=content[:2000] if content else source.description,
+                    content=chunk_data["content"],
                     source=source,
-                    relevance_score=0.5,
+                    relevance_score=relevance,
                     extracted_at=datetime.now(),
                     task_id=source.task_id
                 ))
-        
-        logger.info(f"Reader extracted {len(chunks)} chunks from {len(sources)} sources")
+
         return chunks
+
+    def _create_batch_extraction_prompt(self, pairs: List[tuple], task_query: str) -> str:
+        """Create the multi-document payload (instructions are in BATCH_EXTRACTION_SYSTEM)."""
+        doc_blocks = []
+        for i, (source, content) in enumerate(pairs):
+            content = content or ""
+            doc_blocks.append(
+                f"<<DOC {i}>>\n"
+                f"Title: {source.title}\n"
+                f"URL: {source.url}\n"
+                f"{self._truncate_to_budget(content, task_query, self.DOC_CONTENT_LIMIT)}\n"
+                f"<</DOC {i}>>"
+            )
+        docs = "\n\n".join(doc_blocks)
+
+        return f"{_extraction_prefix(task_query)}\nDocuments to analyze:\n{docs}"
     
     async def _fetch_content(self, url: str) -> str:
         """
@@ -100,8 +428,16 @@ class Reader:
         Returns:
             Extracted main content text or empty string if failed
         """
+        cache = get_fetch_cache()
+        cached = await cache.get_async(url)
+        if cached is not None:
+            logger.debug(f"Fetch cache hit for {url}")
+            return cached
+
         try:
             content = await self.fetcher.fetch_content(url)
+            if content:
+                cache.set_async(url, content)
             return content if content else ""
         except Exception as e:
             logger.error(f"Error fetching content from {url}: {e}")
@@ -155,102 +491,65 @@ class Reader:
             )]
     
     def _create_extraction_prompt(self, content: str, source: Source, task_query: str) -> str:
-        """Create prompt for chunk extraction."""
-        return f"""You are a Content Extraction Agent. Your task is to extract relevant information from web content.
-
-Task Query: {task_query}
-Source Title: {source.title}
-Source URL: {source.url}
+        """Create the single-document payload (instructions are in EXTRACTION_SYSTEM)."""
+        return (
+            f"{_extraction_prefix(task_query)}"
+            f"Source Title: {source.title}\n"
+            f"Source URL: {source.url}\n\n"
+            f"Content to analyze:\n---\n"
+            f"{self._truncate_to_budget(content, task_query, self.EXTRACTION_CONTENT_LIMIT)}\n---"
+        )
 
-Content to analyze:
----
-{content[:8000] if len(content) > 8000 else content}
----
+    async def _get_llm_response(self, prompt: str, model: str, system: str = EXTRACTION_SYSTEM) -> str:
+        """Get response from LLM (static instructions as cacheable system prefix)."""
+        cache = get_llm_cache()
+        cached = cache.get(model, prompt, system)
+        if cached is not None:
+            logger.debug("LLM cache hit for extraction prompt")
+            return cached
 
-Extract the most relevant information chunks that answer the task query.
-Each chunk should be a complete, self-contained piece of information.
-
-Respond ONLY with a valid JSON array in this format:
-[
-  {{
-    "content": "The extracted text chunk with relevant information",
-    "relevance": 0.95
-  }},
-  {{
-    "content": "Another relevant chunk",
-    "relevance": 0.85
-  }}
-]
-
-Guidelines:
-- Relevance score: 0.0 to 1.0 (1.0 = highly relevant)
-- Extract only substantial information, not fluff
-- Each chunk should be 1-3 sentences or a short paragraph
-- Maximum 5 chunks per source
-- If content is not relevant, return empty array []
-"""
-    
-    async def _get_llm_response(self, prompt: str, model: str) -> str:
-        """Get response from LLM (thinking disabled for extraction speed)."""
         messages = [
-            {"role": "system", "content": "You are a precise data extraction assistant. Respond ONLY with valid JSON. Do not think out loud or explain."},
+            {"role": "system", "content": system},
             {"role": "user", "content": prompt}
         ]
-        full_response = ""
-        
+
+        # Accumulate streamed tokens in a list: += on a str re-copies the
+        # whole buffer per token, which goes quadratic on long extractions.
+        parts = []
         async for chunk in self.client.stream_chat(model, messages):
-            full_response += chunk
-        
+            parts.append(chunk)
+        full_response = "".join(parts)
+
         logger.debug(f"RAW LLM response ({len(full_response)} chars): {full_response[:1000]}")
-        
+
         # Strip thinking tags
-        cleaned = re.sub(r'<think>.*?</think>', '', full_response, flags=re.DOTALL)
-        cleaned = re.sub(r'<think>.*', '', cleaned, flags=re.DOTALL)
+        cleaned = _THINK_CLOSED.sub('', full_response)
+        cleaned = _THINK_OPEN.sub('', cleaned)
         cleaned = cleaned.strip()
-        
-        # If stripping think tags left nothing, try to extract JSON from within them
+
+        # If stripping think tags left nothing, try to salvage a JSON array
+        # from the reasoning output (covers closed and unclosed <think>)
         if not cleaned:
-            # Look for JSON array inside think blocks
-            think_match = re.search(r'<think>(.*?)</think>', full_response, flags=re.DOTALL)
-            if think_match:
-                think_content = think_match.group(1)
-                # Try to find a JSON array in the think content
-                json_match = re.search(r'(\[[\s\S]*\])', think_content)
-                if json_match:
-                    cleaned = json_match.group(1).strip()
-                    logger.debug("Salvaged JSON from inside <think> block")
-            # Also check unclosed think
-            if not cleaned:
-                think_match = re.search(r'<think>(.*)', full_response, flags=re.DOTALL)
-                if think_match:
-                    think_content = think_match.group(1)
-                    json_match = re.search(r'(\[[\s\S]*\])', think_content)
-                    if json_match:
-                        cleaned = json_match.group(1).strip()
-                        logger.debug("Salvaged JSON from unclosed <think> block")
-        
+            salvaged = _find_json_array(full_response)
+            if salvaged:
+                cleaned = salvaged.strip()
+                logger.debug("Salvaged JSON array from <think> output")
+
+        cache.set(model, prompt, system, cleaned)
         return cleaned
     
     def _parse_extraction_response(self, response: str) -> List[dict]:
         """Parse JSON response from LLM."""
-        # Clean up response
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        response = response.strip()
-        
+        response = strip_code_fence(response)
+
         try:
-            data = json.loads(response)
+            data = json_loads(response)
             if isinstance(data, list):
                 return data
             elif isinstance(data, dict) and "chunks" in data:
                 return data["chunks"]
             else:
                 return []
-        except json.JSONDecodeError:
+        except ValueError:
             logger.error(f"Failed to parse extraction response: {response[:200]}")
             return []
@@ -1,3 +1,4 @@
+import copy
 import logging
 import os
 import re
@@ -17,6 +18,41 @@ from src.services.deep_research.writer import Writer
 
 logger = logging.getLogger(__name__)
 
+# Precompiled once: these run per line (or per report) of every generated document
+_SAFE_TOPIC_RE = re.compile(r'[^\w\-]')
+_BOLD_SPLIT_RE = re.compile(r'(\*\*.*?\*\*)')
+_CITATION_RE = re.compile(r'^\[\d+\]')
+_THINK_TAG_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+_THINK_OPEN_RE = re.compile(r'<think>.*', re.DOTALL)
+
+
+def _build_odt_template() -> OpenDocumentText:
+    """Build a styles-only ODT document used as the template for every report."""
+    textdoc = OpenDocumentText()
+
+    s_header1 = Style(name="Heading 1", family="paragraph")
+    s_header1.addElement(TextProperties(fontsize="24pt", fontweight="bold"))
+    textdoc.styles.addElement(s_header1)
+
+    s_header2 = Style(name="Heading 2", family="paragraph")
+    s_header2.addElement(TextProperties(fontsize="18pt", fontweight="bold"))
+    textdoc.styles.addElement(s_header2)
+
+    s_text = Style(name="Standard", family="paragraph")
+    s_text.addElement(TextProperties(fontsize="12pt"))
+    textdoc.styles.addElement(s_text)
+
+    s_bold = Style(name="Bold", family="text")
+    s_bold.addElement(TextProperties(fontweight="bold"))
+    textdoc.styles.addElement(s_bold)
+
+    return textdoc
+
+
+# Style DOM construction is the fixed cost of every report; build it once
+# and deepcopy per document instead of redeclaring styles per call
+_ODT_TEMPLATE = _build_odt_template()
+
 
 class DeepResearchService:
     """
@@ -137,81 +173,64 @@ class DeepResearchService:
         """
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_topic = re.sub(r'[^\w\-]', '_', title)[:50]
+        safe_topic = _SAFE_TOPIC_RE.sub('_', title)[:50]
         filename = f"report_{safe_topic}_{timestamp}.odt"
         file_path = os.path.join(DATA_DIR, filename)
-        
+
         # Ensure data directory exists
         os.makedirs(DATA_DIR, exist_ok=True)
-        
-        # Create ODT document
-        textdoc = OpenDocumentText()
-        
-        # Define styles
-        s_header1 = Style(name="Heading 1", family="paragraph")
-        s_header1.addElement(TextProperties(fontsize="24pt", fontweight="bold"))
-        textdoc.styles.addElement(s_header1)
-        
-        s_header2 = Style(name="Heading 2", family="paragraph")
-        s_header2.addElement(TextProperties(fontsize="18pt", fontweight="bold"))
-        textdoc.styles.addElement(s_header2)
-        
-        s_text = Style(name="Standard", family="paragraph")
-        s_text.addElement(TextProperties(fontsize="12pt"))
-        textdoc.styles.addElement(s_text)
-        
-        s_bold = Style(name="Bold", family="text")
-        s_bold.addElement(TextProperties(fontweight="bold"))
-        textdoc.styles.addElement(s_bold)
-        
+
+        # Start from the cached styles-only template and only append content
+        textdoc = copy.deepcopy(_ODT_TEMPLATE)
+
         # Process content
         lines = markdown_content.split('\n')
-        
+
         def add_styled_text(parent_element, text):
             """Helper to parse **bold** and add to element"""
-            parts = re.split(r'(\*\*.*?\*\*)', text)
+            parts = _BOLD_SPLIT_RE.split(text)
             for part in parts:
                 if part.startswith("**") and part.endswith("**"):
-                    s = Span(stylename=s_bold)
+                    s = Span(stylename="Bold")
                     addTextToElement(s, part[2:-2])
                     parent_element.addElement(s)
                 else:
                     addTextToElement(parent_element, part)
-        
+
         for line in lines:
             line = line.strip()
             if not line:
                 continue
-                
+
             if line.startswith("# "):
                 # H1
                 clean_text = line[2:].replace("**", "").strip()
-                h = H(outlinelevel=1, stylename=s_header1, text=clean_text)
+                h = H(outlinelevel=1, stylename="Heading 1", text=clean_text)
                 textdoc.text.addElement(h)
             elif line.startswith("## "):
                 # H2
                 clean_text = line[3:].replace("**", "").strip()
-                h = H(outlinelevel=2, stylename=s_header2, text=clean_text)
+                h = H(outlinelevel=2, stylename="Heading 2", text=clean_text)
                 textdoc.text.addElement(h)
             elif line.startswith("### "):
                 # H3
                 clean_text = line[4:].replace("**", "").strip()
-                h = H(outlinelevel=3, stylename=s_header2, text=clean_text)
+                h = H(outlinelevel=3, stylename="Heading 2", text=clean_text)
                 textdoc.text.addElement(h)
             elif line.startswith("- ") or line.startswith("* "):
                 # Bullet list
-                p = P(stylename=s_text)
+                p = P(stylename="Standard")
                 addTextToElement(p, "• ")
                 add_styled_text(p, line[2:])
                 textdoc.text.addElement(p)
-            elif re.match(r'^\[\d+\]', line):
+            elif _CITATION_RE.match(line):
                 # Citation reference [1], [2], etc.
-                p = P(stylename=s_text)
+                p = P(stylename="Standard")
                 add_styled_text(p, line)
                 textdoc.text.addElement(p)
             else:
                 # Regular paragraph
-                p = P(stylename=s_text)
+                p = P(stylename="Standard")
                 add_styled_text(p, line)
                 textdoc.text.addElement(p)
         
@@ -241,8 +260,8 @@ If uncertain, respond with "English".
                 language += chunk
             
             # Strip thinking tags
-            language = re.sub(r'<think>.*?</think>', '', language, flags=re.DOTALL)
-            language = re.sub(r'<think>.*', '', language, flags=re.DOTALL)
+            language = _THINK_TAG_RE.sub('', language)
+            language = _THINK_OPEN_RE.sub('', language)
             
             return language.strip()
         except Exception as e:
@@ -1,18 +1,25 @@
 """
 Media Service for handling Twitter and YouTube downloads.
 """
+import asyncio
 import os
 import logging
+import re
 from typing import Optional, Tuple, Union
 
 # Import utils
 from utils.youtube_utils import is_youtube_url, download_youtube_video, download_youtube_audio, get_video_title_async
 from utils.twitter_utils import is_twitter_url, download_twitter_video
-from utils.audio_utils import transcribe_audio
+from utils.audio_utils import transcribe_audio_chunked, speedup_audio
 
 logger = logging.getLogger(__name__)
 
 class MediaService:
+    # Download-intent keywords as one precompiled alternation: a single
+    # C-level scan per message instead of N substring tests over a fresh
+    # lowercased copy
+    _DOWNLOAD_RE = re.compile(r"descarga|baja(?:r)?|video|download", re.IGNORECASE)
+
     def __init__(self):
         pass
 
@@ -24,18 +31,21 @@ class MediaService:
         action_type: 'download', 'download_video', 'transcribe'
         url: The extracted URL
         """
+        # Cheap prefilter: both URL detectors require a scheme, so the
+        # majority of plain-text messages skip the regex scans entirely
+        if "http" not in text:
+            return None
+
         # Twitter
         twitter_url = is_twitter_url(text)
         if twitter_url:
-            keywords = ["descarga", "baja", "video", "bajar", "download"]
-            if any(k in text.lower() for k in keywords):
+            if self._DOWNLOAD_RE.search(text):
                 return 'twitter', 'download', twitter_url
-        
+
         # YouTube
         youtube_url = is_youtube_url(text)
         if youtube_url:
-            keywords = ["descarga", "baja", "video", "bajar", "download"]
-            if any(k in text.lower() for k in keywords):
+            if self._DOWNLOAD_RE.search(text):
                 return 'youtube', 'download_video', youtube_url
             else:
                 return 'youtube', 'transcribe', youtube_url
@@ -71,21 +81,30 @@ class MediaService:
         """Transcribe YouTube video. Returns (transcription_text, video_title)"""
         try:
             logger.info(f"Transcribing YouTube video: {url}")
-            video_title = await get_video_title_async(url)
-            audio_path = await download_youtube_audio(url)
-            
-            transcription = await transcribe_audio(audio_path)
-            
-            if os.path.exists(audio_path):
-                # Clean up asynchronously if possible, but os.unlink is fast enough usually. 
-                # For strict async we could use aiofiles.os.remove or to_thread
-                import asyncio
-                await asyncio.to_thread(os.unlink, audio_path)
-                
+            # Title lookup and audio download are independent network
+            # calls; TaskGroup cancels the sibling if either fails
+            async with asyncio.TaskGroup() as tg:
+                title_task = tg.create_task(get_video_title_async(url))
+                audio_task = tg.create_task(download_youtube_audio(url))
+            video_title = title_task.result()
+            audio_path = audio_task.result()
+
+            # Tempo-compress before Whisper: encoder cost scales with
+            # audio duration, so this trims transcription wall time
+            sped_path = await speedup_audio(audio_path)
+
+            transcription = await transcribe_audio_chunked(sped_path)
+
+            for path in {audio_path, sped_path}:
+                if os.path.exists(path):
+                    # Clean up asynchronously if possible, but os.unlink is fast enough usually.
+                    # For strict async we could use aiofiles.os.remove or to_thread
+                    await asyncio.to_thread(os.unlink, path)
+
             return transcription, video_title
         except Exception as e:
             logger.error(f"Error transcribing YouTube video: {e}")
             raise e
 
     def is_media_url(self, text: str) -> bool:
-        return bool(is_twitter_url(text) or is_youtube_url(text))
+        return "http" in text and bool(is_twitter_url(text) or is_youtube_url(text))
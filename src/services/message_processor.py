@@ -14,7 +14,7 @@ import asyncio
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
-from telegram import Update
+from telegram import Update, InputFile
 from telegram.ext import ContextTypes
 from telegram.error import BadRequest
 
@@ -46,12 +46,26 @@ class MessageProcessor:
         self.media_service = media_service
         self.command_service = command_service
         self.command_patterns = command_patterns
+        # Hot patterns checked on every LLM response; bound once here to
+        # skip the dict lookup per response
+        self._math_re = command_patterns['matematicas']
+        self._search_re = command_patterns['search']
         self.upload_service = UploadService()
         
-        # We initialize OllamaClient here or per request? 
+        # We initialize OllamaClient here or per request?
         # Client handles its own connection pooling, so it's fine to instantiate text processing here.
         self.ollama_client = OllamaClient()
 
+        # Model we last asked the backend to load; load_model is idempotent
+        # but the RPC round-trip isn't free, so skip it when unchanged
+        self._current_model: Optional[str] = None
+
+    async def _ensure_model(self, model: str) -> None:
+        """Load the model unless it is already the one we loaded last."""
+        if self._current_model != model:
+            await self.ollama_client.load_model(model)
+            self._current_model = model
+
     async def process_message(
         self, 
         update: Update, 
@@ -70,72 +84,79 @@ class MessageProcessor:
             await context.bot.send_message(chat_id, "⚠️ No text detected.")
             return
 
-        # 1. Initialize chat history if needed
-        history = await self.chat_manager.get_history(chat_id)
-        if not history:
-            # We need a way to get system prompt. passing it in init or fetching?
-            # Ideally passed in init, but it might change? 
-            # Let's assume initialized externally or we fetch it.
-            # For now, let's skip re-init here or assume it's done by caller/ChatManager handle it.
-            # But ChatManager needs it.
-            pass 
+        # History initialization is handled by the caller/ChatManager; the
+        # history itself is fetched below in the same pass that appends the
+        # user message, so no extra copy is made here.
 
         placeholder_msg = None
 
+        # Start RAG retrieval now: it is independent IO, so it runs while
+        # the upload/media branches below do their own network work
+        rag_task = asyncio.create_task(self.rag_service.get_context(user_text))
+
         # 2. Check for Upload Intent (Reply)
         if update.message.reply_to_message:
             processed = await self._handle_reply_upload(update, context, user_text)
             if processed:
+                rag_task.cancel()
                 return
 
         # 3. Check for Media Intent (Twitter/YouTube)
         if self.media_service.is_media_url(user_text):
             processed, transcription_request = await self._handle_media_intent(update, context, user_text, chat_id)
             if processed and not transcription_request:
+                rag_task.cancel()
                 return
             if transcription_request:
                 # If transcription happened, we proceed to LLM with the transcription result
                 user_text = transcription_request
-                # And we likely have a status msg we can reuse? 
+                # And we likely have a status msg we can reuse?
                 # For simplicity, _handle_media_intent returns (processed: bool, new_text: str|None)
 
+                # The prefetched context matched the original message, not
+                # the transcription prompt — refetch for the new text
+                rag_task.cancel()
+                rag_task = asyncio.create_task(self.rag_service.get_context(user_text))
+
         # 4. LLM Generation
         
         # Send typing action
         await context.bot.send_chat_action(chat_id=chat_id, action="typing")
         
-        if not placeholder_msg: 
-             # Only reply to the message if use_reply is True (queue backlog)
-             # Otherwise behave like normal (no quote)
-             try:
+        async def send_placeholder():
+            # Only reply to the message if use_reply is True (queue backlog)
+            # Otherwise behave like normal (no quote)
+            try:
                 if use_reply:
-                    placeholder_msg = await context.bot.send_message(
-                         chat_id=chat_id, 
-                         text="🧠 RAG...", 
-                         reply_to_message_id=message_id
-                    )
-                else:
-                    placeholder_msg = await context.bot.send_message(
-                         chat_id=chat_id, 
-                         text="🧠 RAG..."
+                    return await context.bot.send_message(
+                        chat_id=chat_id,
+                        text="🧠 RAG...",
+                        reply_to_message_id=message_id
                     )
-             except Exception:
+                return await context.bot.send_message(chat_id=chat_id, text="🧠 RAG...")
+            except Exception:
                 # Fallback
-                placeholder_msg = await context.bot.send_message(chat_id=chat_id, text="🧠 RAG...")
+                return await context.bot.send_message(chat_id=chat_id, text="🧠 RAG...")
 
-        # Prepare RAG context
+        # The placeholder send (Telegram RTT), crontab read (subprocess) and
+        # RAG lookup are independent — run them together
         current_time = datetime.now().strftime("%H:%M del %d/%m/%Y")
-        crontab_str = CronUtils.get_readable_agenda()
-        rag_context = await self.rag_service.get_context(user_text)
+        placeholder_msg, crontab_str, rag_context = await asyncio.gather(
+            send_placeholder(),
+            asyncio.to_thread(CronUtils.get_readable_agenda),
+            rag_task
+        )
         
         context_message = f"{user_text} [System: Current time is {current_time}. Schedule: {crontab_str}.{rag_context}]"
-        await self.chat_manager.append_message(chat_id, {"role": "user", "content": context_message})
+        # Append and fetch in one locked pass instead of two
+        history = await self.chat_manager.append_and_get(
+            chat_id, {"role": "user", "content": context_message}
+        )
 
         try:
             await placeholder_msg.edit_text("🧠 LLM...")
-            
+
             # Streaming LLM
-            history = await self.chat_manager.get_history(chat_id)
             model = get_config("MODEL")
             context_limit = get_config("CONTEXT_LIMIT", 30000)
             
@@ -153,7 +174,7 @@ class MessageProcessor:
                      history[-1]["content"] = f"{skills_context}\n\n{history[-1]['content']}"
 
             # Ensure model is strictly loaded with our parameters
-            await self.ollama_client.load_model(model)
+            await self._ensure_model(model)
             
             pruned_history = prune_history(history, context_limit)
             
@@ -233,23 +254,18 @@ class MessageProcessor:
             if media_file:
                  status_msg = await update.message.reply_text(f"📤 Preparing {media_type} for upload...")
                  import tempfile
-                 
+                 import uuid
+
                  try:
-                     # Create temp file asynchronously? No, get_file usage needs path or simple download
-                     # download_to_drive is awaitable
-                     
-                     # Create temp file
-                     def create_temp():
-                         return tempfile.NamedTemporaryFile(suffix=ext, delete=False)
-                     
-                     tmp = await asyncio.to_thread(create_temp)
-                     tmp_path = tmp.name
-                     tmp.close()
+                     # Unique path in the temp dir is pure string work — no
+                     # file is touched until download_to_drive writes it, so
+                     # no thread hop needed
+                     tmp_path = os.path.join(tempfile.gettempdir(), f"upload_{uuid.uuid4().hex}{ext}")
 
                      await media_file.download_to_drive(tmp_path)
                      
                      await status_msg.edit_text("📤 Uploading to Catbox.moe...")
-                     url = await asyncio.to_thread(self.upload_service.upload_to_catbox, tmp_path)
+                     url = await self.upload_service.upload_to_catbox(tmp_path)
                      
                      if url:
                          await status_msg.edit_text(f"✅ Upload complete:\n{url}", disable_web_page_preview=True)
@@ -274,7 +290,7 @@ class MessageProcessor:
         media_action = self.media_service.identify_action(user_text)
         if not media_action:
              return False, None
-             
+
         platform, action_type, url = media_action
         status_msg = await context.bot.send_message(chat_id, f"🎬 Processing {platform}...")
         
@@ -284,12 +300,8 @@ class MessageProcessor:
                 media_path, media_type = await self.media_service.process_twitter(url)
                 await status_msg.edit_text("📤 Uploading...")
                 
-                with open(media_path, 'rb') as f:
-                    if media_type == 'photo':
-                        await context.bot.send_photo(chat_id, photo=f)
-                    else:
-                        await context.bot.send_video(chat_id, video=f)
-                
+                await self._send_media_file(context, chat_id, media_path, media_type)
+
                 await asyncio.to_thread(os.unlink, media_path)
                 await status_msg.delete()
                 return True, None
@@ -300,9 +312,8 @@ class MessageProcessor:
                     video_path = await self.media_service.download_youtube(url)
                     await status_msg.edit_text("📤 Uploading...")
                     
-                    with open(video_path, 'rb') as f:
-                        await context.bot.send_video(chat_id, video=f)
-                        
+                    await self._send_media_file(context, chat_id, video_path, 'video')
+
                     await asyncio.to_thread(os.unlink, video_path)
                     await status_msg.delete()
                     return True, None
@@ -328,9 +339,39 @@ class MessageProcessor:
         except Exception as e:
             await status_msg.edit_text(f"❌ Error: {str(e)}")
             return True, None # Error handled
-            
+
         return False, None
 
+    # Bot API caps direct uploads at 50 MB; larger files go via Catbox
+    _TG_UPLOAD_LIMIT = 50 * 1024 * 1024
+
+    async def _send_media_file(self, context, chat_id: int, media_path: str, media_type: str) -> None:
+        """Send a downloaded media file without buffering it all in memory."""
+        size = os.path.getsize(media_path)
+
+        if size > self._TG_UPLOAD_LIMIT:
+            url = await self.upload_service.upload_to_catbox(media_path)
+            if url:
+                await context.bot.send_message(
+                    chat_id,
+                    f"📦 File too large for Telegram ({size >> 20} MB), uploaded here:\n{url}"
+                )
+                return
+            raise RuntimeError("File exceeds Telegram upload limit and Catbox upload failed")
+
+        # read_file_handle=False lets PTB stream the handle instead of
+        # slurping the whole file into memory before the request
+        with open(media_path, 'rb') as f:
+            media = InputFile(f, read_file_handle=False)
+            if media_type == 'photo':
+                await context.bot.send_photo(
+                    chat_id, photo=media, read_timeout=120, write_timeout=600
+                )
+            else:
+                await context.bot.send_video(
+                    chat_id, video=media, read_timeout=120, write_timeout=600
+                )
+
     async def _post_process_llm_response(
         self, 
         full_response: str, 
@@ -344,9 +385,13 @@ class MessageProcessor:
         Handle post-processing of LLM response (Math, Search).
         Returns the (possibly updated) full response.
         """
-        
+        # Fast path: every command starts with ':::'; skip the regex
+        # checks entirely for the common command-free reply
+        if ':::' not in full_response:
+            return full_response
+
         # 1. Math Command
-        if self.command_patterns['matematicas'].search(full_response):
+        if self._math_re.search(full_response):
             await placeholder_msg.edit_text("🧮 Solving math...")
             
             original_model = get_config("MODEL")
@@ -370,8 +415,8 @@ class MessageProcessor:
             # If the original model is loaded and we are switching to another, unload it
             if math_model != original_model:
                 await self.ollama_client.unload_model(original_model)
-                
-            await self.ollama_client.load_model(math_model)
+
+            await self._ensure_model(math_model)
             
             math_response = await stream_to_telegram(
                 self.ollama_client.stream_chat(math_model, math_messages),
@@ -381,11 +426,12 @@ class MessageProcessor:
             # Unload the math model if it's different from the original base model
             if math_model != original_model:
                 await self.ollama_client.unload_model(math_model)
-                
+                self._current_model = None
+
             return math_response
             
         # 2. Search Command
-        search_match = self.command_patterns['search'].search(full_response)
+        search_match = self._search_re.search(full_response)
         if search_match:
             search_query = search_match.group(1).strip()
             await placeholder_msg.edit_text(f"🔍 Searching & scraping: {search_query}...")
@@ -394,18 +440,17 @@ class MessageProcessor:
             
             # Add intermediate exchange to history
             await self.chat_manager.append_message(chat_id, {"role": "assistant", "content": full_response})
-            await self.chat_manager.append_message(chat_id, {
+            history = await self.chat_manager.append_and_get(chat_id, {
                 "role": "user",
                 "content": f"[Search results for '{search_query}']:\n{search_results}"
             })
-            
+
             # Re-query LLM with search results
-            history = await self.chat_manager.get_history(chat_id)
             model = get_config("MODEL")
             context_limit = get_config("CONTEXT_LIMIT", 30000)
             
-            await self.ollama_client.load_model(model)
-            
+            await self._ensure_model(model)
+
             final_response = await stream_to_telegram(
                 self.ollama_client.stream_chat(model, prune_history(history, context_limit)),
                 placeholder_msg
@@ -15,24 +15,18 @@ class RagService:
         Retrieve and format context from vector store.
         """
         try:
-            # Search both collections
-            docs_results = await self.vector_manager.search(query, collection_type="documents", limit=limit)
-            mem_results = await self.vector_manager.search(query, collection_type="memory", limit=limit)
-            
-            # Combine and sort by similarity
-            all_results = docs_results + mem_results
-            all_results.sort(key=lambda x: x.get('similarity', 0), reverse=True)
-            
-            # Take top results
-            search_results = all_results[:limit]
-            
+            # One call searches both collections: the query is embedded once
+            # and the collection lookups run concurrently
+            search_results = await self.vector_manager.search_multi(
+                query, collection_types=["documents", "memory"], limit=limit
+            )
+
             if search_results:
                  logger.info(f"🔍 RAG Results found: {len(search_results)}")
-                 rag_entries = [
+                 context = "\n\n# Contexto Recuperado (RAG)\n" + "\n".join(
                     f"- {res['content']} (Sim: {res.get('similarity', 0):.2f})"
                     for res in search_results
-                ]
-                 context = "\n\n# Contexto Recuperado (RAG)\n" + "\n".join(rag_entries)
+                )
                  logger.info(f"📄 RAG Context injected: {context[:50]}...")
                  return context
             else:
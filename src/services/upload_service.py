@@ -2,9 +2,11 @@
 Upload Service for handling file uploads to external services like Catbox.moe.
 Includes fallback to Litterbox when Catbox is unavailable.
 """
+import asyncio
 import os
 import httpx
 import logging
+import re
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -14,10 +16,49 @@ LITTERBOX_API = 'https://litterbox.catbox.moe/resources/internals/api.php'
 
 
 class UploadService:
+    # Upload-intent keywords as one precompiled alternation (see
+    # MediaService._DOWNLOAD_RE): one scan instead of N substring tests
+    _UPLOAD_RE = re.compile(r"catbox|sube|upload|carga|link|url|litterbox", re.IGNORECASE)
+
+    # Shared async client: uploads are pure IO, so running them on the
+    # event loop (instead of bouncing through asyncio.to_thread) frees a
+    # worker thread per upload and lets several chats upload concurrently
+    _shared_client: Optional[httpx.AsyncClient] = None
+
+    # Caps in-flight uploads across all instances so a burst of chats
+    # doesn't trip Catbox rate limiting
+    _upload_sem: Optional[asyncio.Semaphore] = None
+
     def __init__(self, userhash: Optional[str] = None):
         self.userhash = userhash
 
-    def _upload_to_catbox_direct(self, file_path: str) -> tuple[Optional[str], Optional[str]]:
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """Get or create the shared upload concurrency limit."""
+        if cls._upload_sem is None:
+            try:
+                from utils.config_loader import get_config
+                limit = get_config("MAX_CONCURRENT_UPLOADS", 5)
+            except Exception:
+                limit = 5
+            cls._upload_sem = asyncio.Semaphore(limit)
+        return cls._upload_sem
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Get or create the shared httpx client."""
+        if cls._shared_client is None or cls._shared_client.is_closed:
+            cls._shared_client = httpx.AsyncClient(
+                timeout=120,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60
+                )
+            )
+        return cls._shared_client
+
+    async def _upload_to_catbox_direct(self, file_path: str) -> tuple[Optional[str], Optional[str]]:
         """
         Direct upload to Catbox.moe API.
         Returns (url, error_message) tuple.
@@ -25,11 +66,14 @@ class UploadService:
         data = {'reqtype': 'fileupload'}
         if self.userhash:
             data['userhash'] = self.userhash
-            
-        with open(file_path, 'rb') as f:
-            files = {'fileToUpload': (os.path.basename(file_path), f)}
-            response = httpx.post(CATBOX_API, data=data, files=files, timeout=120)
-        
+
+        # 1 MiB read buffer: multi-MB videos stream in large blocks instead
+        # of the default 8 KiB reads
+        async with self._get_semaphore():
+            with open(file_path, 'rb', buffering=1 << 20) as f:
+                files = {'fileToUpload': (os.path.basename(file_path), f)}
+                response = await self._get_client().post(CATBOX_API, data=data, files=files)
+
         if response.status_code == 200:
             url = response.text.strip()
             if url and url.startswith('https://'):
@@ -41,7 +85,7 @@ class UploadService:
         else:
             return None, f"HTTP {response.status_code}: {response.text[:100]}"
 
-    def _upload_to_litterbox(self, file_path: str, expire_time: str = "72h") -> tuple[Optional[str], Optional[str]]:
+    async def _upload_to_litterbox(self, file_path: str, expire_time: str = "72h") -> tuple[Optional[str], Optional[str]]:
         """
         Upload to Litterbox (temporary file hosting).
         expire_time options: "1h", "12h", "24h", "72h"
@@ -51,11 +95,12 @@ class UploadService:
             'reqtype': 'fileupload',
             'time': expire_time
         }
-        
-        with open(file_path, 'rb') as f:
-            files = {'fileToUpload': (os.path.basename(file_path), f)}
-            response = httpx.post(LITTERBOX_API, data=data, files=files, timeout=120)
-        
+
+        async with self._get_semaphore():
+            with open(file_path, 'rb', buffering=1 << 20) as f:
+                files = {'fileToUpload': (os.path.basename(file_path), f)}
+                response = await self._get_client().post(LITTERBOX_API, data=data, files=files)
+
         if response.status_code == 200:
             url = response.text.strip()
             if url and url.startswith('https://'):
@@ -65,7 +110,7 @@ class UploadService:
         else:
             return None, f"HTTP {response.status_code}: {response.text[:100]}"
 
-    def upload_to_catbox(self, file_path: str, use_fallback: bool = True) -> Optional[str]:
+    async def upload_to_catbox(self, file_path: str, use_fallback: bool = True) -> Optional[str]:
         """
         Uploads a file to Catbox.moe and returns the URL.
         Falls back to Litterbox if Catbox is unavailable.
@@ -83,18 +128,18 @@ class UploadService:
 
         # Try Catbox first
         logger.info(f"Uploading to Catbox: {file_path}")
-        url, error = self._upload_to_catbox_direct(file_path)
-        
+        url, error = await self._upload_to_catbox_direct(file_path)
+
         if url:
             logger.info(f"Catbox upload successful: {url}")
             return url
-        
+
         logger.warning(f"Catbox upload failed: {error}")
-        
+
         # Fallback to Litterbox
         if use_fallback:
             logger.info(f"Trying Litterbox fallback for: {file_path}")
-            url, error = self._upload_to_litterbox(file_path)
+            url, error = await self._upload_to_litterbox(file_path)
             
             if url:
                 logger.info(f"Litterbox upload successful (expires in 72h): {url}")
@@ -104,7 +149,7 @@ class UploadService:
         
         return None
 
-    def upload_to_litterbox(self, file_path: str, expire_time: str = "72h") -> Optional[str]:
+    async def upload_to_litterbox(self, file_path: str, expire_time: str = "72h") -> Optional[str]:
         """
         Uploads a file directly to Litterbox (temporary hosting).
         
@@ -119,8 +164,8 @@ class UploadService:
             logger.error(f"File not found: {file_path}")
             return None
             
-        url, error = self._upload_to_litterbox(file_path, expire_time)
-        
+        url, error = await self._upload_to_litterbox(file_path, expire_time)
+
         if url:
             logger.info(f"Litterbox upload successful: {url}")
             return url
@@ -132,8 +177,4 @@ class UploadService:
         """Check if text indicates an intent to upload."""
         if not text:
             return False
-        
-        text_lower = text.lower()
-        triggers = ["catbox", "sube", "upload", "carga", "link", "url", "litterbox"]
-        
-        return any(t in text_lower for t in triggers)
+        return bool(self._UPLOAD_RE.search(text))
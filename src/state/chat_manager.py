@@ -72,6 +72,24 @@ class ChatManager:
             self._last_activity[chat_id] = datetime.now()
             logger.debug(f"Message appended to chat {chat_id}")
     
+    async def append_and_get(self, chat_id: int, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Append a message and return the updated history in one locked pass.
+
+        Args:
+            chat_id: Telegram chat ID
+            message: Message dictionary with 'role' and 'content'
+
+        Returns:
+            Copy of the updated chat history list
+        """
+        async with self._get_lock(chat_id):
+            if chat_id not in self._histories:
+                self._histories[chat_id] = []
+            self._histories[chat_id].append(message)
+            self._last_activity[chat_id] = datetime.now()
+            return self._histories[chat_id].copy()
+
     async def clear_history(self, chat_id: int) -> None:
         """
         Clear chat history for a specific chat.
@@ -3,9 +3,12 @@ import os
 import re
 import sys
 import asyncio
+import functools
 import logging
 import signal
 import atexit
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
 from telegram import Update
@@ -55,7 +58,7 @@ TOKEN = os.getenv("TELEGRAM_TOKEN")
 
 # Authorization
 AUTHORIZED_USERS_RAW = os.getenv("AUTHORIZED_USERS", "")
-AUTHORIZED_USERS = [int(uid.strip()) for uid in AUTHORIZED_USERS_RAW.split(",") if uid.strip().isdigit()]
+AUTHORIZED_USERS = frozenset(int(uid.strip()) for uid in AUTHORIZED_USERS_RAW.split(",") if uid.strip().isdigit())
 
 NOTIFICATION_CHAT_ID_RAW = os.getenv("NOTIFICATION_CHAT_ID", "")
 NOTIFICATION_CHAT_ID = int(NOTIFICATION_CHAT_ID_RAW) if NOTIFICATION_CHAT_ID_RAW.strip().isdigit() else None
@@ -63,46 +66,40 @@ NOTIFICATION_CHAT_ID = int(NOTIFICATION_CHAT_ID_RAW) if NOTIFICATION_CHAT_ID_RAW
 # Setup logging
 logger = setup_logging(TOKEN)
 
-# Global instances (State)
-chat_manager = ChatManager(max_inactive_hours=24)
-vector_manager = VectorManager(get_all_config(), OllamaClient())
-message_queue = asyncio.Queue()
-queue_worker_running = False
-last_activity = datetime.now()
+# Per-chat queues and workers: one queue per chat preserves in-chat
+# ordering while a slow call in one chat no longer blocks the others.
+# Each queue is a plain deque plus a wake-up Event — cheaper than
+# asyncio.Queue, which allocates getter futures on every get()
+per_chat_queues: dict[int, tuple[deque, asyncio.Event]] = {}
+per_chat_workers: dict[int, asyncio.Task] = {}
+_dispatch_lock = asyncio.Lock()
+WORKER_IDLE_TIMEOUT = 60.0
 
-# Initialize Services
-rag_service = RagService(vector_manager)
-media_service = MediaService()
+# Outbox: notification-style sends are queued here and drained by a
+# single writer task, so workers never stall on an egress round-trip
+_outbox: asyncio.Queue | None = None
+_outbox_task: asyncio.Task | None = None
 
-# Initialize email digest job (only if feature enabled)
-email_digest_job = EmailDigestJob(notification_chat_id=NOTIFICATION_CHAT_ID) if is_feature_enabled("EMAIL_DIGEST") else None
+last_activity = datetime.now()
 
 # Config values
 MODEL = get_config("MODEL")
-COMMAND_PATTERNS = {
-    'memory': re.compile(r':::memory(?!_delete):*\s*(.+?):::', re.DOTALL),
-    'memory_delete': re.compile(r':::memory_delete:*\s*(.+?):::', re.DOTALL),
-    'cron': re.compile(r':::cron(?!_delete):*\s*(.+?):::', re.DOTALL),
-    'cron_delete': re.compile(r':::cron_delete:*\s*(.+?):::'),
-    'search': re.compile(r':::search:*\s*(.+?):::', re.DOTALL),
-    'foto': re.compile(r':::foto:*\s*(.+?):::', re.IGNORECASE),
-    'luz': re.compile(r':::luz:*\s+(\S+)\s+(\S+)(?:\s+(\S+))?:::'),
-    'camara': re.compile(r':::camara:*(?:\s+\S+)?:::'),
-    'matematicas': re.compile(r':::matematicas:::'),
-    'terminal': re.compile(r':::terminal:*\s*(.+?):::', re.DOTALL),
-}
-
-# Initialize Command Service
-command_service = CommandService(vector_manager, COMMAND_PATTERNS, CONFIG_DIR)
-
-# Initialize Message Processor
-message_processor = MessageProcessor(
-    chat_manager=chat_manager,
-    rag_service=rag_service,
-    media_service=media_service,
-    command_service=command_service,
-    command_patterns=COMMAND_PATTERNS
-)
+
+@functools.cache
+def get_command_patterns() -> dict:
+    """Compile the :::command::: patterns (cached after the first call)."""
+    return {
+        'memory': re.compile(r':::memory(?!_delete):*\s*(.+?):::', re.DOTALL),
+        'memory_delete': re.compile(r':::memory_delete:*\s*(.+?):::', re.DOTALL),
+        'cron': re.compile(r':::cron(?!_delete):*\s*(.+?):::', re.DOTALL),
+        'cron_delete': re.compile(r':::cron_delete:*\s*(.+?):::'),
+        'search': re.compile(r':::search:*\s*(.+?):::', re.DOTALL),
+        'foto': re.compile(r':::foto:*\s*(.+?):::', re.IGNORECASE),
+        'luz': re.compile(r':::luz:*\s+(\S+)\s+(\S+)(?:\s+(\S+))?:::'),
+        'camara': re.compile(r':::camara:*(?:\s+\S+)?:::'),
+        'matematicas': re.compile(r':::matematicas:::'),
+        'terminal': re.compile(r':::terminal:*\s*(.+?):::', re.DOTALL),
+    }
 
 # System instructions
 system_instructions = ""
@@ -127,9 +124,20 @@ def kill_existing_bot():
                 old_pid = int(f.read().strip())
             try:
                 os.kill(old_pid, signal.SIGTERM)
-                logger.info(f"Killed existing bot process (PID: {old_pid})")
+                logger.info(f"Sent SIGTERM to existing bot process (PID: {old_pid})")
                 import time
-                time.sleep(2)
+                # Poll with backoff instead of a blanket sleep: the old
+                # process usually exits in well under 2s, and waiting it
+                # out fully avoids racing it on the getUpdates lock
+                for delay in (0.05, 0.1, 0.2, 0.4, 0.8, 1.0):
+                    try:
+                        os.kill(old_pid, 0)
+                    except ProcessLookupError:
+                        break
+                    time.sleep(delay)
+                else:
+                    logger.warning(f"Process {old_pid} did not exit, sending SIGKILL")
+                    os.kill(old_pid, signal.SIGKILL)
             except ProcessLookupError:
                 logger.info(f"No process found with PID {old_pid}")
             except (PermissionError, Exception) as e:
@@ -149,9 +157,7 @@ def write_pid():
 
 def is_authorized(user_id: int) -> bool:
     """Check if a user is authorized."""
-    if not AUTHORIZED_USERS:
-        return False
-    return user_id in AUTHORIZED_USERS
+    return bool(AUTHORIZED_USERS) and user_id in AUTHORIZED_USERS
 
 def load_instructions():
     """Load system instructions from file (skills are now loaded via embeddings)."""
@@ -172,125 +178,207 @@ def load_instructions():
         logger.error(f"Error loading instructions: {e}")
 
 def get_system_prompt():
-    """Get system instructions."""
-    return system_instructions if system_instructions else ""
+    """Get system instructions (already a string; rebound only on reload)."""
+    return system_instructions
 
 def update_activity():
     """Update last activity timestamp."""
     global last_activity
     last_activity = datetime.now()
 
-is_generating = False
+_generating_count = 0
 
 def get_is_generating() -> bool:
     """Check if bot is actively generating a response."""
-    return is_generating
-
-# Initialize handlers
-command_handlers = CommandHandlers(
-    chat_manager=chat_manager,
-    is_authorized_func=is_authorized,
-    get_system_prompt_func=get_system_prompt,
-    email_digest_job=email_digest_job,
-    update_activity_func=update_activity
-)
-
-voice_handler = VoiceHandler(
-    is_authorized_func=is_authorized,
-    message_queue=message_queue,
-    start_worker_func=None  # Will be set later
-)
-
-audio_handler = AudioHandler(is_authorized_func=is_authorized)
+    return _generating_count > 0
+
+@dataclass
+class Services:
+    """Container for the bot's heavyweight singletons."""
+    chat_manager: ChatManager
+    vector_manager: VectorManager
+    rag_service: RagService
+    media_service: MediaService
+    command_service: CommandService
+    message_processor: MessageProcessor
+    email_digest_job: EmailDigestJob | None
+    command_handlers: CommandHandlers
+    voice_handler: VoiceHandler
+    audio_handler: AudioHandler
+    photo_handler: PhotoHandler
+    video_handler: VideoHandler
+    document_handler: DocumentHandler
+
+@functools.cache
+def get_services() -> Services:
+    """Build the service graph on first use.
+
+    Kept out of module import so CLI entry points that never start the
+    bot (doctor, --help) don't pay for ChromaDB and model-client setup.
+    """
+    chat_manager = ChatManager(max_inactive_hours=24)
+    vector_manager = VectorManager(get_all_config(), OllamaClient())
+    command_patterns = get_command_patterns()
+
+    rag_service = RagService(vector_manager)
+    media_service = MediaService()
+    email_digest_job = EmailDigestJob(notification_chat_id=NOTIFICATION_CHAT_ID) if is_feature_enabled("EMAIL_DIGEST") else None
+
+    command_service = CommandService(vector_manager, command_patterns, CONFIG_DIR)
+    message_processor = MessageProcessor(
+        chat_manager=chat_manager,
+        rag_service=rag_service,
+        media_service=media_service,
+        command_service=command_service,
+        command_patterns=command_patterns
+    )
 
-photo_handler = PhotoHandler(
-    chat_manager=chat_manager,
-    is_authorized_func=is_authorized,
-    get_system_prompt_func=get_system_prompt,
-    command_patterns=COMMAND_PATTERNS
-)
+    command_handlers = CommandHandlers(
+        chat_manager=chat_manager,
+        is_authorized_func=is_authorized,
+        get_system_prompt_func=get_system_prompt,
+        email_digest_job=email_digest_job,
+        update_activity_func=update_activity,
+        reload_instructions_func=load_instructions
+    )
+    voice_handler = VoiceHandler(
+        is_authorized_func=is_authorized,
+        enqueue_func=None  # Set below: enqueue_message is defined later
+    )
+    voice_handler.enqueue = enqueue_message
+    audio_handler = AudioHandler(is_authorized_func=is_authorized)
+    photo_handler = PhotoHandler(
+        chat_manager=chat_manager,
+        is_authorized_func=is_authorized,
+        get_system_prompt_func=get_system_prompt,
+        command_patterns=command_patterns
+    )
+    video_handler = VideoHandler(
+        chat_manager=chat_manager,
+        is_authorized_func=is_authorized,
+        get_system_prompt_func=get_system_prompt,
+        command_patterns=command_patterns
+    )
+    document_handler = DocumentHandler(
+        chat_manager=chat_manager,
+        vector_manager=vector_manager,
+        is_authorized_func=is_authorized,
+        get_system_prompt_func=get_system_prompt,
+        command_patterns=command_patterns
+    )
 
-video_handler = VideoHandler(
-    chat_manager=chat_manager,
-    is_authorized_func=is_authorized,
-    get_system_prompt_func=get_system_prompt,
-    command_patterns=COMMAND_PATTERNS
-)
+    return Services(
+        chat_manager=chat_manager,
+        vector_manager=vector_manager,
+        rag_service=rag_service,
+        media_service=media_service,
+        command_service=command_service,
+        message_processor=message_processor,
+        email_digest_job=email_digest_job,
+        command_handlers=command_handlers,
+        voice_handler=voice_handler,
+        audio_handler=audio_handler,
+        photo_handler=photo_handler,
+        video_handler=video_handler,
+        document_handler=document_handler,
+    )
 
-document_handler = DocumentHandler(
-    chat_manager=chat_manager,
-    vector_manager=vector_manager,
-    is_authorized_func=is_authorized,
-    get_system_prompt_func=get_system_prompt,
-    command_patterns=COMMAND_PATTERNS
-)
+async def chat_worker(chat_id: int):
+    """Process messages for one chat, in order. Exits when idle."""
+    global last_activity, _generating_count
 
-async def queue_worker():
-    """Process messages from queue."""
-    global queue_worker_running, last_activity, is_generating
-    
+    services = get_services()
+    pending, has_items = per_chat_queues[chat_id]
     try:
         while True:
-            try:
-                item = await asyncio.wait_for(message_queue.get(), timeout=1.0)
-                update, context, needs_reply = item[0], item[1], item[2]
-                text_override = item[3] if len(item) > 3 else None
-            except asyncio.TimeoutError:
-                return
-            
+            # Burst drain: items already waiting (e.g. after a getUpdates
+            # batch) are popped without touching the timeout machinery
+            while not pending:
+                # Clearing before waiting is race-free here: nothing can
+                # append between the check and the clear (no await), and
+                # an append during the wait sets the event again
+                has_items.clear()
+                try:
+                    # asyncio.timeout (3.11+) is cheaper per iteration than
+                    # wait_for: no wrapper task or callback churn per call
+                    async with asyncio.timeout(WORKER_IDLE_TIMEOUT):
+                        await has_items.wait()
+                except asyncio.TimeoutError:
+                    return
+            update, context, needs_reply, text_override = pending.popleft()
+
             last_activity = datetime.now()
-            is_generating = True
+            _generating_count += 1
             try:
                 # Initialize chat in ChatManager if needed (redundant check but safe)
-                chat_id = update.effective_chat.id
-                history = await chat_manager.get_history(chat_id)
+                history = await services.chat_manager.get_history(chat_id)
                 if not history:
-                     await chat_manager.initialize_chat(chat_id, get_system_prompt())
-                
+                     await services.chat_manager.initialize_chat(chat_id, get_system_prompt())
+
                 # Determine text
                 text = text_override or update.message.text
-                
+
                 # Process with MessageProcessor
-                await message_processor.process_message(update, context, text, use_reply=needs_reply)
-                
+                await services.message_processor.process_message(update, context, text, use_reply=needs_reply)
+
             except Exception as e:
                 logger.error(f"Error processing text message in queue: {e}", exc_info=True)
-                try:
-                    chat_id = update.effective_chat.id
-                    await context.bot.send_message(chat_id, f"❌ Error processing message: {e}")
-                except Exception:
-                    pass
+                send_async(chat_id, f"❌ Error processing message: {e}")
             finally:
-                is_generating = False
+                _generating_count -= 1
                 last_activity = datetime.now()
-            
-            message_queue.task_done()
-    finally:
-        queue_worker_running = False
 
-def start_worker_if_needed():
-    global queue_worker_running
-    if not queue_worker_running:
-        queue_worker_running = True
-        asyncio.create_task(queue_worker())
+    finally:
+        # Deregister under the lock; a message that raced the idle
+        # timeout gets a fresh worker instead of being stranded
+        async with _dispatch_lock:
+            if per_chat_workers.get(chat_id) is asyncio.current_task():
+                del per_chat_workers[chat_id]
+                if not pending:
+                    per_chat_queues.pop(chat_id, None)
+                else:
+                    per_chat_workers[chat_id] = asyncio.create_task(chat_worker(chat_id))
+
+async def enqueue_message(update: Update, context: ContextTypes.DEFAULT_TYPE, text_override=None):
+    """Queue an update for its chat's worker, spawning one if needed."""
+    chat_id = update.effective_chat.id
+    async with _dispatch_lock:
+        pending, has_items = per_chat_queues.setdefault(chat_id, (deque(), asyncio.Event()))
+        needs_reply = bool(pending)
+        pending.append((update, context, needs_reply, text_override))
+        has_items.set()
+        worker = per_chat_workers.get(chat_id)
+        if worker is None or worker.done():
+            per_chat_workers[chat_id] = asyncio.create_task(chat_worker(chat_id))
+
+async def _outbox_worker(bot):
+    """Drain the outbox, reusing the bot's pooled connection per send."""
+    while True:
+        chat_id, text, kwargs = await _outbox.get()
+        try:
+            await bot.send_message(chat_id, text, **kwargs)
+        except Exception as e:
+            logger.warning(f"Outbox send failed for chat {chat_id}: {e}")
 
-voice_handler.start_worker = start_worker_if_needed
+def send_async(chat_id: int, text: str, **kwargs):
+    """Queue a fire-and-forget message; drops silently if the writer isn't up."""
+    if _outbox is not None:
+        _outbox.put_nowait((chat_id, text, kwargs))
 
 @rate_limit(max_messages=10, window_seconds=60)
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle text messages."""
     user_id = update.effective_user.id
-    
+
     if not is_authorized(user_id):
-        await update.message.reply_text(
+        send_async(
+            update.effective_chat.id,
             f"⛔ Access denied. Your ID: `{user_id}`",
             parse_mode="Markdown"
         )
         return
-    
-    needs_reply = not message_queue.empty()
-    await message_queue.put((update, context, needs_reply, None))
-    start_worker_if_needed()
+
+    await enqueue_message(update, context)
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Global error handler for unhandled exceptions."""
@@ -306,13 +394,7 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
     
     logger.error(f"Unhandled exception: {error}", exc_info=error)
     if update and hasattr(update, 'effective_chat') and update.effective_chat:
-        try:
-            await context.bot.send_message(
-                update.effective_chat.id,
-                f"❌ Unexpected error: {error}"
-            )
-        except Exception:
-            pass
+        send_async(update.effective_chat.id, f"❌ Unexpected error: {error}")
 
 def _validate_startup():
     """Pre-flight checks before starting the bot."""
@@ -330,23 +412,38 @@ def _validate_startup():
     ollama_url = backend_cfg.get("OLLAMA_URL", "http://localhost:11434") if isinstance(backend_cfg, dict) else "http://localhost:11434"
     lmstudio_url = backend_cfg.get("LMSTUDIO_URL", "http://localhost:1234") if isinstance(backend_cfg, dict) else "http://localhost:1234"
     
-    try:
+    # Probe definitions: (url, non-200 error, unreachable error)
+    if provider == "lmstudio":
+        probes = [(
+            f"{lmstudio_url}/v1/models",
+            f"LM Studio returned non-200 status at {lmstudio_url}",
+            f"LM Studio is not reachable at {lmstudio_url} — make sure it is running",
+        )]
+    else:
+        probes = [(
+            f"{ollama_url}/api/tags",
+            "Ollama returned non-200 status",
+            f"Ollama is not reachable at {ollama_url} — run 'ollama serve'",
+        )]
+
+    async def _run_probes():
+        # Concurrent async probes: startup cost is bounded by the
+        # slowest single probe rather than the sum of timeouts
         import httpx
-        if provider == "lmstudio":
-            # Check LM Studio
-            r = httpx.get(f"{lmstudio_url}/v1/models", timeout=3)
-            if r.status_code != 200:
-                errors.append(f"LM Studio returned non-200 status at {lmstudio_url}")
-        else:
-            r = httpx.get(f"{ollama_url}/api/tags", timeout=3)
-            if r.status_code != 200:
-                errors.append("Ollama returned non-200 status")
-    except Exception:
-        if provider == "lmstudio":
-            errors.append(f"LM Studio is not reachable at {lmstudio_url} — make sure it is running")
-        else:
-            errors.append(f"Ollama is not reachable at {ollama_url} — run 'ollama serve'")
-    
+
+        async def _probe(url, bad_status_err, unreachable_err):
+            try:
+                r = await client.get(url)
+                if r.status_code != 200:
+                    errors.append(bad_status_err)
+            except Exception:
+                errors.append(unreachable_err)
+
+        async with httpx.AsyncClient(timeout=3.0) as client:
+            await asyncio.gather(*(_probe(*p) for p in probes))
+
+    asyncio.run(_run_probes())
+
     if errors:
         print("\n❌ FemtoBot startup failed:\n")
         for err in errors:
@@ -357,34 +454,68 @@ def _validate_startup():
         logger.info(f"Backend: {provider} ({lmstudio_url if provider == 'lmstudio' else ollama_url})")
 
 
+async def _post_init(application):
+    """Loop-dependent setup that must run inside PTB's event loop."""
+    global _outbox, _outbox_task
+
+    # Eager task execution on 3.12+: new tasks run synchronously up to
+    # their first suspension, saving a scheduler round-trip for the many
+    # short-lived tasks the bot spawns
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("Eager task factory enabled")
+
+    _outbox = asyncio.Queue()
+    _outbox_task = asyncio.create_task(_outbox_worker(application.bot))
+
+async def _post_shutdown(application):
+    """Release pooled connections before the loop closes."""
+    from utils.search_utils import aclose_shared_client
+
+    await OllamaClient.aclose_shared()
+    await aclose_shared_client()
+
 def main():
     """Main entry point."""
+    # uvloop (optional): drop-in libuv event loop, faster across every
+    # await in the polling/streaming workload; skipped when unavailable
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+            logger.info("uvloop event loop installed")
+        except ImportError:
+            pass
+
     _validate_startup()
     kill_existing_bot()
     write_pid()
     load_instructions()
-    
-    application = ApplicationBuilder().token(TOKEN).build()
+
+    services = get_services()
+
+    application = ApplicationBuilder().token(TOKEN).post_init(_post_init).post_shutdown(_post_shutdown).build()
     application.add_error_handler(error_handler)
-    
+
     # Command handlers
-    application.add_handler(CommandHandler("start", command_handlers.start))
-    application.add_handler(CommandHandler("new", command_handlers.new_conversation))
-    application.add_handler(CommandHandler("status", command_handlers.status))
-    application.add_handler(CommandHandler("unload", command_handlers.unload_models))
-    application.add_handler(CommandHandler("restart", command_handlers.restart_bot))
-    application.add_handler(CommandHandler("stop", command_handlers.stop_bot))
-    if is_feature_enabled("EMAIL_DIGEST") and email_digest_job:
-        application.add_handler(CommandHandler("digest", command_handlers.email_digest))
+    application.add_handler(CommandHandler("start", services.command_handlers.start))
+    application.add_handler(CommandHandler("new", services.command_handlers.new_conversation))
+    application.add_handler(CommandHandler("status", services.command_handlers.status))
+    application.add_handler(CommandHandler("unload", services.command_handlers.unload_models))
+    application.add_handler(CommandHandler("restart", services.command_handlers.restart_bot))
+    application.add_handler(CommandHandler("stop", services.command_handlers.stop_bot))
+    application.add_handler(CommandHandler("reload", services.command_handlers.reload_instructions_cmd))
+    if is_feature_enabled("EMAIL_DIGEST") and services.email_digest_job:
+        application.add_handler(CommandHandler("digest", services.command_handlers.email_digest))
     if is_feature_enabled("DEEP_RESEARCH"):
-        application.add_handler(CommandHandler("deep", command_handlers.deep_research))
-    
+        application.add_handler(CommandHandler("deep", services.command_handlers.deep_research))
+
     # Message handlers
-    application.add_handler(MessageHandler(filters.VOICE, voice_handler.handle))
-    application.add_handler(MessageHandler(filters.AUDIO, audio_handler.handle))
-    application.add_handler(MessageHandler(filters.PHOTO, photo_handler.handle))
-    application.add_handler(MessageHandler(filters.VIDEO, video_handler.handle))
-    application.add_handler(MessageHandler(filters.Document.ALL, document_handler.handle))
+    application.add_handler(MessageHandler(filters.VOICE, services.voice_handler.handle))
+    application.add_handler(MessageHandler(filters.AUDIO, services.audio_handler.handle))
+    application.add_handler(MessageHandler(filters.PHOTO, services.photo_handler.handle))
+    application.add_handler(MessageHandler(filters.VIDEO, services.video_handler.handle))
+    application.add_handler(MessageHandler(filters.Document.ALL, services.document_handler.handle))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     
     # Background jobs
@@ -412,7 +543,7 @@ def main():
         name=inactivity_job.name
     )
     
-    cleanup_job = CleanupJob(chat_manager=chat_manager)
+    cleanup_job = CleanupJob(chat_manager=services.chat_manager)
     application.job_queue.run_repeating(
         cleanup_job.run,
         interval=cleanup_job.interval_seconds,
@@ -420,12 +551,12 @@ def main():
         name=cleanup_job.name
     )
     
-    if NOTIFICATION_CHAT_ID and is_feature_enabled("EMAIL_DIGEST") and email_digest_job:
+    if NOTIFICATION_CHAT_ID and is_feature_enabled("EMAIL_DIGEST") and services.email_digest_job:
         application.job_queue.run_repeating(
-            email_digest_job.run,
-            interval=email_digest_job.interval_seconds,
+            services.email_digest_job.run,
+            interval=services.email_digest_job.interval_seconds,
             first=60,
-            name=email_digest_job.name
+            name=services.email_digest_job.name
         )
         logger.info("Email digest job scheduled")
     
@@ -436,15 +567,31 @@ def main():
     if skills_dict:
         logger.info(f"Loaded {len(skills_dict)} skills, initializing Vector Store...")
         loop = asyncio.get_event_loop()
-        loop.run_until_complete(vector_manager.initialize_skills(skills_dict))
+        loop.run_until_complete(services.vector_manager.initialize_skills(skills_dict))
     
     # Run with conflict retry logic
     max_retries = 10
     retry_delay = 3
-    
+
     for attempt in range(max_retries):
         try:
-            application.run_polling()
+            if os.getenv("TELEGRAM_MODE", "").lower() == "webhook":
+                # Webhook mode: no polling at all; Telegram pushes updates
+                application.run_webhook(
+                    listen="0.0.0.0",
+                    port=int(os.getenv("WEBHOOK_PORT", "8443")),
+                    url_path=TOKEN,
+                    webhook_url=os.getenv("WEBHOOK_URL"),
+                )
+            else:
+                # Real long polling: the getUpdates call parks server-side
+                # for up to 25s instead of short-timeout busy polling
+                application.run_polling(
+                    timeout=25,
+                    poll_interval=0.0,
+                    bootstrap_retries=-1,
+                    allowed_updates=Update.ALL_TYPES,
+                )
             break
         except Conflict as e:
             if attempt < max_retries - 1:
@@ -5,6 +5,8 @@ from textual.widgets import Input, Header, Footer, Static, Markdown
 import re
 import os
 import sys
+import time
+import fcntl
 import logging
 from datetime import datetime
 
@@ -39,36 +41,84 @@ class MessageWidget(Markdown):
             self.timestamp = datetime.now().strftime("%H:%M")
         else:
             self.timestamp = timestamp
-            
+
         super().__init__(content)
         self.is_user = is_user
         self.add_class("message")
-        
+
         if is_user:
             self.add_class("user-message")
         else:
             self.add_class("bot-message")
-            
+
         if extra_classes:
             self.add_class(extra_classes)
-            
-    def format_content(self, content):
-        """Format message content."""
-        # Strip ANSI codes
-        content = re.sub(r'\x1b\[[0-9;]*m', '', content)
-        
-        # Format think blocks
-        content = content.replace("<think>", "> 🧠 **Thinking:**\n> ")
-        content = content.replace("</think>", "\n\n")
-        
-        # Add timestamp
-        if self.timestamp:
-            content += f"  \n_{self.timestamp}_"
-        
-        return content
+
+        # Incremental formatting state: streamed updates only reformat
+        # the newly appended suffix instead of the whole buffer per chunk
+        self._raw_prefix = ""
+        self._formatted = ""
+
+    def _advance(self, raw: str) -> None:
+        """Format raw text past the already-processed prefix.
+
+        Single-pass scanner that strips ANSI SGR sequences and rewrites
+        <think> tags. A token cut off at the end of the buffer (partial
+        escape code or tag) is held back until the next chunk completes it.
+        """
+        i = len(self._raw_prefix)
+        n = len(raw)
+        out = []
+
+        while i < n:
+            c = raw[i]
+            if c == '\x1b':
+                j = i + 1
+                if j < n and raw[j] == '[':
+                    j += 1
+                    while j < n and raw[j] in '0123456789;':
+                        j += 1
+                    if j < n and raw[j] == 'm':
+                        i = j + 1  # complete SGR sequence: drop it
+                        continue
+                if j >= n:
+                    break  # possibly incomplete escape: hold back
+                out.append(c)
+                i += 1
+            elif c == '<':
+                if raw.startswith("<think>", i):
+                    out.append("> 🧠 **Thinking:**\n> ")
+                    i += 7
+                elif raw.startswith("</think>", i):
+                    out.append("\n\n")
+                    i += 8
+                elif n - i < 8 and ("<think>".startswith(raw[i:]) or "</think>".startswith(raw[i:])):
+                    break  # possibly incomplete tag: hold back
+                else:
+                    out.append(c)
+                    i += 1
+            else:
+                # Bulk-copy up to the next special character
+                j = i
+                while j < n and raw[j] != '<' and raw[j] != '\x1b':
+                    j += 1
+                out.append(raw[i:j])
+                i = j
+
+        self._formatted += ''.join(out)
+        self._raw_prefix = raw[:i]
 
     async def update(self, content):
-        await super().update(self.format_content(content))
+        if not content.startswith(self._raw_prefix):
+            # Content was rewritten (e.g. commands stripped): reformat fully
+            self._raw_prefix = ""
+            self._formatted = ""
+        self._advance(content)
+
+        text = self._formatted
+        if self.timestamp:
+            text += f"  \n_{self.timestamp}_"
+        await super().update(text)
 
 
 class FemtoBotApp(App):
@@ -103,6 +153,7 @@ class FemtoBotApp(App):
         self.events_file = os.path.join(CONFIG_DIR, get_config("EVENTS_FILE"))
         if not os.path.exists(self.events_file):
             open(self.events_file, 'w').close()
+        self._events_mtime_ns = 0
         
         # Load system instructions (synchronously)
         self._system_instructions = ""
@@ -123,7 +174,7 @@ class FemtoBotApp(App):
     
     async def _add_system_message(self, message: str, style: str = "info"):
         """Add a system message to the chat display."""
-        container = self.query_one("#chat-container")
+        container = self._chat_container
         msg_container = Vertical(classes=f"message-container bot-container {style}-container")
         await container.mount(msg_container)
         
@@ -143,6 +194,15 @@ class FemtoBotApp(App):
 
     async def on_mount(self):
         """Called when app mounts."""
+        # Eager task factory (3.12+): new tasks run synchronously up to
+        # their first suspension, saving a scheduler round-trip per task
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+        # Cache the chat container: query_one walks the DOM, and the
+        # streaming loop would otherwise pay that walk per render
+        self._chat_container = self.query_one("#chat-container")
+
         # Initialize chat with system instructions
         if self._system_instructions:
             await self.chat_manager.initialize_chat(self.chat_id, self._system_instructions)
@@ -164,20 +224,40 @@ class FemtoBotApp(App):
             "info"
         )
 
+    def _drain_events(self) -> str:
+        """Stat-gate and drain the events file (blocking; run in a thread).
+
+        Returns the drained content, empty when nothing changed. The drain
+        happens under an advisory lock so a cron writer appending at the
+        same moment can't lose lines to the truncate.
+        """
+        # One stat when idle: skip the open/read entirely unless the
+        # file has grown or changed since the last drain
+        st = os.stat(self.events_file)
+        if st.st_size == 0 or st.st_mtime_ns == self._events_mtime_ns:
+            return ""
+        self._events_mtime_ns = st.st_mtime_ns
+
+        fd = os.open(self.events_file, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            content = os.read(fd, os.fstat(fd).st_size).decode('utf-8', errors='replace')
+            os.ftruncate(fd, 0)
+        finally:
+            os.close(fd)
+        return content
+
     async def check_events(self):
         """Check for events from cron jobs."""
         try:
-            if os.path.getsize(self.events_file) > 0:
-                with open(self.events_file, 'r+', encoding='utf-8') as f:
-                    content = f.read()
-                    if content.strip():
-                        for line in content.strip().split('\n'):
-                            if line.strip():
-                                await self._add_system_message(f"🔔 {line.strip()}", "notification")
-                        
-                        # Clear file
-                        f.seek(0)
-                        f.truncate()
+            # File IO off the loop: a slow disk must not stall rendering
+            content = await asyncio.to_thread(self._drain_events)
+
+            for line in content.strip().split('\n'):
+                if line.strip():
+                    await self._add_system_message(f"🔔 {line.strip()}", "notification")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error checking events: {e}")
 
@@ -192,7 +272,10 @@ class FemtoBotApp(App):
             await self.client.unload_model(self.model)
         if self.vision_model:
             await self.client.unload_model(self.vision_model)
-        
+        await OllamaClient.aclose_shared()
+        from utils.search_utils import aclose_shared_client
+        await aclose_shared_client()
+
         logger.info("FemtoBot TUI shutdown complete")
 
     async def on_input_submitted(self, event: Input.Submitted):
@@ -209,8 +292,8 @@ class FemtoBotApp(App):
             self.exit()
             return
         
-        container = self.query_one("#chat-container")
-        
+        container = self._chat_container
+
         # Check for slash commands
         if message.startswith('/'):
             await self._handle_slash_command(message, container)
@@ -271,15 +354,25 @@ class FemtoBotApp(App):
         
         full_response = ""
         first_chunk = True
-        
+
+        # Debounce rendering: Markdown.update re-parses the whole buffer,
+        # so cap re-renders at ~30 Hz instead of one per token
+        render_interval = 1 / 30
+        last_render = 0.0
+        container = self._chat_container
+
         async for chunk in self.client.stream_chat(self.model, pruned):
             if first_chunk:
                 full_response = ""
                 first_chunk = False
             full_response += chunk
-            await widget.update(full_response)
-            self.query_one("#chat-container").scroll_end(animate=False)
-        
+
+            now = time.monotonic()
+            if now - last_render >= render_interval:
+                last_render = now
+                await widget.update(full_response)
+                container.scroll_end(animate=False)
+
         # Set timestamp and final update
         widget.timestamp = datetime.now().strftime("%H:%M")
         await widget.update(full_response)
@@ -302,11 +395,16 @@ class FemtoBotApp(App):
             {"role": "assistant", "content": clean_response}
         )
         
-        # Save history
+        # Save history, trimming the stored copy so a long session's
+        # memory (and the next request's prompt) stays bounded
         history = await self.chat_manager.get_history(self.chat_id)
+        trimmed = prune_history(history, get_config("CONTEXT_LIMIT", 30000))
+        if len(trimmed) < len(history):
+            await self.chat_manager.set_history(self.chat_id, trimmed)
+            history = trimmed
         self.history_manager.save_history(history, "default")
-        
-        self.query_one("#chat-container").scroll_end(animate=True)
+
+        container.scroll_end(animate=True)
 
 
 # Import needed here for on_mount
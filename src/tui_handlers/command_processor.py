@@ -10,25 +10,32 @@ from src.client import OllamaClient
 from utils.cron_utils import CronUtils
 from utils.wiz_utils import control_light
 from utils.config_loader import get_config
-from utils.telegram_utils import escape_markdown
+from utils.telegram_utils import escape_markdown, prune_history
 
 logger = logging.getLogger(__name__)
 
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+
 
 class TUICommandProcessor:
     """Process all :::xxx::: commands in TUI."""
-    
-    # Pre-compiled patterns
-    PATTERNS = {
-        'memory': re.compile(r':::memory(?!_delete):*\s*(.+?):::', re.DOTALL),
-        'memory_delete': re.compile(r':::memory_delete:*\s*(.+?):::', re.DOTALL),
-        'cron': re.compile(r':::cron(?!_delete):*\s*(.+?):::', re.DOTALL),
-        'cron_delete': re.compile(r':::cron_delete:*\s*(.+?):::'),
-        'search': re.compile(r':::search:*\s*(.+?):::', re.DOTALL),
-        'foto': re.compile(r':::foto:*\s*(.+?):::', re.IGNORECASE),
-        'luz': re.compile(r':::luz:*\s+(\S+)\s+(\S+)(?:\s+(\S+))?:::'),
-    }
-    
+
+    # All command patterns fused into one alternation with named groups:
+    # the response is scanned once instead of once per pattern. Scoped
+    # inline flags ((?s:...), (?i:...)) reproduce each original
+    # pattern's DOTALL / IGNORECASE behaviour.
+    SCANNER = re.compile(
+        r'(?P<memory>(?s::::memory(?!_delete):*\s*(?P<memory_arg>.+?):::))'
+        r'|(?P<memory_delete>(?s::::memory_delete:*\s*(?P<memory_delete_arg>.+?):::))'
+        r'|(?P<cron>(?s::::cron(?!_delete):*\s*(?P<cron_arg>.+?):::))'
+        r'|(?P<cron_delete>:::cron_delete:*\s*(?P<cron_delete_arg>.+?):::)'
+        r'|(?P<search>(?s::::search:*\s*(?P<search_arg>.+?):::))'
+        r'|(?P<foto>(?i::::foto:*\s*(?P<foto_arg>.+?):::))'
+        r'|(?P<luz>:::luz:*\s+(?P<luz_name>\S+)\s+(?P<luz_action>\S+)(?:\s+(?P<luz_value>\S+))?:::)'
+    )
+
+    _COMMAND_TYPES = ('memory', 'memory_delete', 'cron', 'cron_delete', 'search', 'foto', 'luz')
+
     def __init__(self, output_callback: Callable[[str, str], None]):
         """
         Initialize processor.
@@ -49,25 +56,40 @@ class TUICommandProcessor:
         Returns:
             Cleaned response (commands removed)
         """
+        commands = self._scan(response)
+
         # Handle search first (needs LLM follow-up)
-        search_match = self.PATTERNS['search'].search(response)
-        if search_match:
-            return await self._handle_search(search_match, response, chat_history)
-        
+        if 'search' in commands:
+            return await self._handle_search(commands['search'][0], response, chat_history)
+
         # Process other commands
-        await self._process_cron_commands(response)
-        await self._process_memory_commands(response)
-        await self._process_light_commands(response)
-        
+        await self._process_cron_commands(commands)
+        await self._process_memory_commands(commands)
+        await self._process_light_commands(commands)
+
         # Remove all command patterns from response
         cleaned = self._clean_response(response)
         return cleaned
-    
+
+    def _scan(self, text: str) -> Dict[str, List]:
+        """Single-pass scan: collect command matches grouped by type."""
+        found: Dict[str, List] = {}
+        # Every command starts with ':::'; one substring check skips the
+        # regex machinery for the common command-free response
+        if ':::' not in text:
+            return found
+        for match in self.SCANNER.finditer(text):
+            for name in self._COMMAND_TYPES:
+                if match.group(name) is not None:
+                    found.setdefault(name, []).append(match)
+                    break
+        return found
+
     async def _handle_search(self, match, response: str, chat_history: List[Dict]) -> str:
         """Handle search command."""
         from utils.search_utils import WebSearch
         
-        query = match.group(1).strip()
+        query = match.group('search_arg').strip()
         self.output(f"🔍 Searching: {query}", "info")
         
         try:
@@ -84,8 +106,10 @@ class TUICommandProcessor:
             client = OllamaClient()
             model = get_config("MODEL")
             
+            pruned = prune_history(chat_history, get_config("CONTEXT_LIMIT", 30000))
+
             follow_up = ""
-            async for chunk in client.stream_chat(model, chat_history):
+            async for chunk in client.stream_chat(model, pruned):
                 follow_up += chunk
             
             # Strip thinking tags
@@ -93,8 +117,9 @@ class TUICommandProcessor:
             follow_up = re.sub(r'<think>.*', '', follow_up, flags=re.DOTALL)
             
             # Process any commands in follow-up
-            await self._process_cron_commands(follow_up)
-            await self._process_memory_commands(follow_up)
+            follow_up_commands = self._scan(follow_up)
+            await self._process_cron_commands(follow_up_commands)
+            await self._process_memory_commands(follow_up_commands)
             
             cleaned = self._clean_response(follow_up)
             return cleaned
@@ -104,13 +129,13 @@ class TUICommandProcessor:
             self.output(f"❌ Search error: {e}", "error")
             return self._clean_response(response)
     
-    async def _process_cron_commands(self, response: str):
+    async def _process_cron_commands(self, commands: Dict[str, List]):
         """Process cron add/delete commands."""
         events_file = os.path.join(CONFIG_DIR, get_config("EVENTS_FILE"))
-        
+
         # Delete commands
-        for match in self.PATTERNS['cron_delete'].finditer(response):
-            target = match.group(1).strip()
+        for match in commands.get('cron_delete', ()):
+            target = match.group('cron_delete_arg').strip()
             self.output(f"🗑️ Removing task: {target}", "info")
             
             if CronUtils.delete_job(target):
@@ -119,8 +144,8 @@ class TUICommandProcessor:
                 self.output("⚠️ No matching tasks found", "warning")
         
         # Add commands - new simplified format: tipo minuto hora dia mes nombre
-        for match in self.PATTERNS['cron'].finditer(response):
-            cron_content = match.group(1).strip()
+        for match in commands.get('cron', ()):
+            cron_content = match.group('cron_arg').strip()
             parts = cron_content.split(None, 5)
             
             if len(parts) < 6:
@@ -153,13 +178,13 @@ class TUICommandProcessor:
             else:
                 self.output("❌ Error adding task", "error")
     
-    async def _process_memory_commands(self, response: str):
+    async def _process_memory_commands(self, commands: Dict[str, List]):
         """Process memory add/delete commands."""
         memory_path = os.path.join(CONFIG_DIR, get_config("MEMORY_FILE"))
-        
+
         # Delete commands
-        for match in self.PATTERNS['memory_delete'].finditer(response):
-            target = match.group(1).strip()
+        for match in commands.get('memory_delete', ()):
+            target = match.group('memory_delete_arg').strip()
             if not target:
                 continue
             
@@ -181,8 +206,8 @@ class TUICommandProcessor:
                 self.output(f"❌ Error: {e}", "error")
         
         # Add commands
-        for match in self.PATTERNS['memory'].finditer(response):
-            content = match.group(1).strip()
+        for match in commands.get('memory', ()):
+            content = match.group('memory_arg').strip()
             if not content:
                 continue
             
@@ -193,12 +218,12 @@ class TUICommandProcessor:
             except Exception as e:
                 self.output(f"❌ Error: {e}", "error")
     
-    async def _process_light_commands(self, response: str):
+    async def _process_light_commands(self, commands: Dict[str, List]):
         """Process WIZ light commands."""
-        for match in self.PATTERNS['luz'].finditer(response):
-            name = match.group(1).strip()
-            action = match.group(2).strip()
-            value = match.group(3).strip() if match.group(3) else None
+        for match in commands.get('luz', ()):
+            name = match.group('luz_name').strip()
+            action = match.group('luz_action').strip()
+            value = match.group('luz_value').strip() if match.group('luz_value') else None
             
             try:
                 result = await control_light(name, action, value)
@@ -208,17 +233,8 @@ class TUICommandProcessor:
     
     def _clean_response(self, response: str) -> str:
         """Remove all command patterns from response."""
-        cleaned = response
-        
-        # Remove all command patterns
-        cleaned = self.PATTERNS['memory'].sub('', cleaned)
-        cleaned = self.PATTERNS['memory_delete'].sub('', cleaned)
-        cleaned = self.PATTERNS['cron'].sub('', cleaned)
-        cleaned = self.PATTERNS['cron_delete'].sub('', cleaned)
-        cleaned = self.PATTERNS['search'].sub('', cleaned)
-        cleaned = self.PATTERNS['foto'].sub('', cleaned)
-        cleaned = self.PATTERNS['luz'].sub('', cleaned)
-        
+        cleaned = self.SCANNER.sub('', response) if ':::' in response else response
+
         # Clean up whitespace
-        cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
+        cleaned = _MULTI_NEWLINE_RE.sub('\n\n', cleaned)
         return cleaned.strip()
@@ -5,12 +5,15 @@ import sys
 # Añadir el directorio raíz al path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from src.services.deep_research_service import DeepResearchService
+# Heavy imports (service pulls in odfpy + the full client stack) stay inside
+# test bodies so collecting this file costs milliseconds, not seconds
 
 
 @pytest.mark.asyncio
 async def test_odt_generation():
     """Test ODT file generation from markdown."""
+    from src.services.deep_research_service import DeepResearchService
+
     service = DeepResearchService()
     file_path = "test_report.odt"
     markdown_content = "# Title\n\n## Section\n\n- Item 1\n- Item 2\n\n**Bold Text**\n\n## References\n\n[1] Source Title - https://example.com"
@@ -31,6 +34,8 @@ async def test_odt_generation():
 @pytest.mark.asyncio
 async def test_research_service_initialization():
     """Test that the service initializes correctly with new architecture."""
+    from src.services.deep_research_service import DeepResearchService
+
     service = DeepResearchService()
     
     assert service.max_iterations == 15
@@ -1,6 +1,11 @@
 """Audio transcription utilities using faster-whisper."""
 import os
 import asyncio
+import functools
+import re
+import shutil
+import tempfile
+import time
 from pathlib import Path
 from utils.config_loader import get_config
 import gc
@@ -8,20 +13,82 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "transcribe_audio",
+    "transcribe_audio_chunked",
+    "transcribe_audio_large",
+    "speedup_audio",
+    "is_whisper_available",
+    "unload_whisper_model",
+    "unload_whisper_model_large",
+]
+
 # Lazy load whisper to avoid import errors if not installed
 _model = None
 _model_large = None
 
+# Idle eviction state: models stay hot across bursts of voice messages
+# and are unloaded only after a period with no transcriptions, instead
+# of paying the full weight load on every call
+_model_last_used = 0.0
+_evictor_task = None
+
+# One transcription job at a time: CT2 already saturates the CPU cores,
+# so overlapping jobs would only thrash cache and slow both down
+_whisper_lock = asyncio.Lock()
+
+_WS_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=None)
+def _whisper_language() -> str:
+    """Config language, memoized: the only per-call lookup left in the
+    transcription hot path. Cleared by reload_config()."""
+    return get_config("WHISPER_LANGUAGE")
+
+
+def _pick_device() -> tuple:
+    """
+    Choose device and compute type for whisper models.
+
+    Config overrides (WHISPER_DEVICE / WHISPER_COMPUTE_TYPE) win;
+    otherwise a CUDA GPU is used when CTranslate2 can see one, falling
+    back to int8 on CPU.
+    """
+    device = get_config("WHISPER_DEVICE")
+    compute = get_config("WHISPER_COMPUTE_TYPE")
+    if device:
+        return device, compute or "int8"
+
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda", compute or "int8_float16"
+    except Exception:
+        pass
+    return "cpu", compute or "int8"
+
+
+def _load_model(model_name: str):
+    from faster_whisper import WhisperModel
+    device, compute = _pick_device()
+    model = WhisperModel(
+        model_name,
+        device=device,
+        compute_type=compute,
+        cpu_threads=os.cpu_count() or 4,
+        num_workers=1,
+    )
+    logger.info(f"Loaded whisper model: {model_name} ({device}/{compute})")
+    return model
+
 
 def get_whisper_model():
     """Lazy load faster-whisper model for voice messages."""
     global _model
     if _model is None:
         try:
-            from faster_whisper import WhisperModel
-            model_name = get_config("WHISPER_MODEL_VOICE")
-            _model = WhisperModel(model_name, device="cpu", compute_type="int8")
-            logger.info(f"Loaded whisper model: {model_name}")
+            _model = _load_model(get_config("WHISPER_MODEL_VOICE"))
         except ImportError:
             logger.error("faster-whisper not installed")
             return None
@@ -33,10 +100,7 @@ def get_whisper_model_large():
     global _model_large
     if _model_large is None:
         try:
-            from faster_whisper import WhisperModel
-            model_name = get_config("WHISPER_MODEL_EXTERNAL")
-            _model_large = WhisperModel(model_name, device="cpu", compute_type="int8")
-            logger.info(f"Loaded large whisper model: {model_name}")
+            _model_large = _load_model(get_config("WHISPER_MODEL_EXTERNAL"))
         except ImportError:
             logger.error("faster-whisper not installed")
             return None
@@ -53,6 +117,29 @@ def unload_whisper_model():
         logger.debug("Unloaded whisper model")
 
 
+def _touch_model():
+    """Mark the whisper models as in use and ensure the evictor runs."""
+    global _model_last_used, _evictor_task
+    _model_last_used = time.monotonic()
+    if _evictor_task is None or _evictor_task.done():
+        try:
+            _evictor_task = asyncio.get_running_loop().create_task(_idle_evictor())
+        except RuntimeError:
+            # No running loop (sync caller): models stay resident
+            pass
+
+
+async def _idle_evictor():
+    """Unload whisper models after a period with no transcriptions."""
+    ttl = get_config("WHISPER_IDLE_TTL_SECONDS", 300)
+    while True:
+        await asyncio.sleep(60)
+        if time.monotonic() - _model_last_used > ttl:
+            unload_whisper_model()
+            unload_whisper_model_large()
+            return
+
+
 def unload_whisper_model_large():
     """Unload the large whisper model from memory."""
     global _model_large
@@ -63,101 +150,378 @@ def unload_whisper_model_large():
         logger.debug("Unloaded large whisper model")
 
 
-def _transcribe_sync(model, audio_path: str, language: str):
-    """Synchronous transcription helper."""
-    segments, info = model.transcribe(
-        audio_path, 
+async def speedup_audio(audio_path: str, factor: float = None) -> str:
+    """
+    Speed up an audio file with ffmpeg's atempo filter before transcription.
+
+    Whisper encoder cost scales with audio duration, so a ~1.75x tempo
+    cuts transcription wall time almost proportionally with minimal
+    accuracy loss. Returns the path to the sped-up file, or the original
+    path if the factor is disabled (<= 1) or ffmpeg fails.
+
+    Args:
+        audio_path: Path to the source audio file
+        factor: Tempo factor; defaults to config TRANSCRIBE_SPEEDUP (1.75)
+
+    Returns:
+        Path to the audio file to transcribe
+    """
+    if factor is None:
+        factor = get_config("TRANSCRIBE_SPEEDUP", 1.75)
+
+    if not factor or factor <= 1:
+        return audio_path
+
+    base, ext = os.path.splitext(audio_path)
+    sped_path = f"{base}_sped{ext}"
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-y', '-i', audio_path,
+            '-filter:a', f'atempo={factor}', '-vn', sped_path,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        returncode = await process.wait()
+
+        if returncode == 0 and os.path.exists(sped_path):
+            logger.debug(f"Audio sped up {factor}x for transcription")
+            return sped_path
+
+        logger.warning(f"ffmpeg atempo failed (code {returncode}), transcribing original")
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found, transcribing original audio")
+    except Exception as e:
+        logger.warning(f"Audio speedup failed: {e}, transcribing original")
+
+    if os.path.exists(sped_path):
+        os.unlink(sped_path)
+    return audio_path
+
+
+def _transcribe_kwargs(language: str, beam_size: int = None) -> dict:
+    """Shared transcription options.
+
+    VAD skips non-speech frames before they reach the encoder (often
+    30-60% of a voice note), and greedy decoding (beam_size=1) is the
+    fast default; the quality path passes a wider beam explicitly.
+    """
+    if beam_size is None:
+        beam_size = get_config("WHISPER_BEAM_SIZE", 1)
+
+    kwargs = dict(
         language=language,
-        beam_size=1,
+        beam_size=beam_size,
         best_of=1,
         temperature=0,
-        vad_filter=True,
-        vad_parameters=dict(min_silence_duration_ms=500)
+        condition_on_previous_text=False,
+    )
+    if get_config("WHISPER_VAD", True):
+        kwargs.update(
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500),
+        )
+    return kwargs
+
+
+def _transcribe_sync(model, audio_path: str, language: str, beam_size: int = None):
+    """Synchronous transcription helper (used for short per-segment jobs)."""
+    segments, info = model.transcribe(
+        _load_audio_16k(audio_path), **_transcribe_kwargs(language, beam_size)
     )
-    
-    text_parts = []
-    for segment in segments:
-        text_parts.append(segment.text.strip())
-    
-    return " ".join(text_parts).strip()
+
+    # Single whitespace-collapse pass instead of per-segment strips
+    # followed by a split/rejoin over the whole transcript
+    return _WS_RE.sub(" ", " ".join(s.text for s in segments)).strip()
+
+
+# Decoded-PCM cache keyed by (path, mtime): a voice note retried with
+# the large model (or transcribed twice) skips the second decode.
+# Only short clips are kept — long audio would pin tens of MB per entry.
+_AUDIO_CACHE: dict = {}
+_AUDIO_CACHE_MAX = 4
+_AUDIO_CACHE_MAX_SAMPLES = 16000 * 600  # ~10 minutes at 16 kHz
+
+
+def _load_audio_16k(path: str):
+    """
+    Decode an audio file to 16 kHz mono float32 once, ahead of
+    transcription, instead of letting each model.transcribe() call pay
+    its own decode. Returns the ndarray, or the original path if
+    decoding fails (faster-whisper then decodes it itself).
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    key = (path, mtime)
+
+    cached = _AUDIO_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        from faster_whisper.audio import decode_audio
+        audio = decode_audio(path, sampling_rate=16000)
+    except Exception as e:
+        logger.debug(f"Pre-decode failed for {path}: {e}, passing path through")
+        return path
+
+    if len(audio) <= _AUDIO_CACHE_MAX_SAMPLES:
+        if len(_AUDIO_CACHE) >= _AUDIO_CACHE_MAX:
+            _AUDIO_CACHE.pop(next(iter(_AUDIO_CACHE)))
+        _AUDIO_CACHE[key] = audio
+    return audio
+
+
+# Queue sentinel marking generator exhaustion in the streaming path
+_STREAM_DONE = object()
 
 
-async def transcribe_audio(audio_path: str) -> str:
+def _decode_to_queue(model, audio_path, language, beam_size, loop, queue):
+    """
+    Runs in a worker thread: iterate the CT2 segment generator and hand
+    each decoded segment's text to the event loop as it becomes
+    available, so the caller can show partial results while the tail of
+    the audio is still decoding.
+    """
+    try:
+        segments, info = model.transcribe(
+            _load_audio_16k(audio_path), **_transcribe_kwargs(language, beam_size)
+        )
+        for segment in segments:
+            loop.call_soon_threadsafe(queue.put_nowait, segment.text)
+    except Exception as e:
+        loop.call_soon_threadsafe(queue.put_nowait, e)
+    finally:
+        loop.call_soon_threadsafe(queue.put_nowait, _STREAM_DONE)
+
+
+async def _transcribe_streaming(
+    model, audio_path: str, language: str,
+    beam_size: int = None, progress_callback=None,
+) -> str:
+    """
+    Transcribe while streaming segments out of the decode thread.
+
+    The first segment arrives seconds into a long audio instead of after
+    full decode; progress_callback (async, takes the partial transcript)
+    fires as each segment lands.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    worker = loop.run_in_executor(
+        None, _decode_to_queue, model, audio_path, language, beam_size, loop, queue
+    )
+
+    parts = []
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            parts.append(item)
+            if progress_callback:
+                try:
+                    await progress_callback(_WS_RE.sub(" ", " ".join(parts)).strip())
+                except Exception as e:
+                    logger.debug(f"Transcription progress callback failed: {e}")
+    finally:
+        await worker
+
+    return _WS_RE.sub(" ", " ".join(parts)).strip()
+
+
+async def transcribe_audio(audio_path: str, progress_callback=None) -> str:
     """
     Transcribes an audio file using faster-whisper.
-    Runs the blocking transcription in a thread.
-    
+    Segments stream out of the decode thread as they finish, so
+    progress_callback (async, receives the partial transcript) can show
+    partial results long before the full audio is decoded.
+
     Args:
         audio_path: Path to audio file
-        
+        progress_callback: Optional async callable fired per decoded segment
+
     Returns:
         Transcription text or error message
     """
     model = get_whisper_model()
-    
+
     if model is None:
         return "[Error: faster-whisper not installed. Run: pip install faster-whisper]"
-    
+
     try:
-        language = get_config("WHISPER_LANGUAGE")
-        
-        # Run blocking operation in thread
-        transcription = await asyncio.to_thread(
-            _transcribe_sync, model, audio_path, language
-        )
-        
-        transcription = " ".join(transcription.split())
-        
+        language = _whisper_language()
+
+        async with _whisper_lock:
+            transcription = await _transcribe_streaming(
+                model, audio_path, language, progress_callback=progress_callback
+            )
+
         if transcription:
             logger.info(f"Transcription completed ({len(transcription)} chars)")
             return transcription
         else:
             return "[No audio content detected]"
         
-    except Exception as e:
-        logger.error(f"Transcription error: {e}")
-        return f"[Transcription error: {str(e)}]"
+    except (RuntimeError, OSError, ValueError):
+        # Expected failure modes (CT2 runtime, file IO, bad audio): log the
+        # full traceback, keep the user-visible message short — CT2 errors
+        # can embed model paths and multi-KB detail. Anything else (and
+        # CancelledError) propagates so bugs stay loud and timeouts cancel.
+        logger.exception("Transcription failed")
+        return "[Transcription error]"
     finally:
-        unload_whisper_model()
+        # Keep the model hot for follow-up messages; the idle evictor
+        # unloads it once the burst is over
+        _touch_model()
+
+
+async def _segment_audio(audio_path: str, chunk_s: int) -> tuple[str, list]:
+    """
+    Split an audio file into ~chunk_s second segments with ffmpeg stream
+    copy (no re-encode). Returns (segment_dir, sorted segment paths);
+    an empty list means segmentation failed and the caller should
+    transcribe the original file.
+    """
+    seg_dir = await asyncio.to_thread(tempfile.mkdtemp)
+    ext = os.path.splitext(audio_path)[1] or '.mp3'
+    pattern = os.path.join(seg_dir, f'seg_%03d{ext}')
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-y', '-i', audio_path,
+            '-f', 'segment', '-segment_time', str(chunk_s), '-c', 'copy',
+            pattern,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        returncode = await process.wait()
+        if returncode != 0:
+            logger.warning(f"ffmpeg segmentation failed (code {returncode})")
+            return seg_dir, []
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found, skipping audio segmentation")
+        return seg_dir, []
+
+    segments = sorted(
+        os.path.join(seg_dir, f) for f in os.listdir(seg_dir)
+        if f.startswith('seg_')
+    )
+    return seg_dir, segments
 
 
-async def transcribe_audio_large(audio_path: str) -> str:
+async def transcribe_audio_chunked(audio_path: str, chunk_s: int = 30) -> str:
+    """
+    Transcribes an audio file by splitting it into bounded segments and
+    decoding them concurrently.
+
+    Long audio (e.g. a 30-minute video) otherwise runs as one sequential
+    Whisper pass; segment-level parallelism scales with available cores
+    and bounds per-call memory. Segment order is preserved in the output.
+
+    Args:
+        audio_path: Path to audio file
+        chunk_s: Target segment length in seconds
+
+    Returns:
+        Transcription text or error message
+    """
+    model = get_whisper_model()
+
+    if model is None:
+        return "[Error: faster-whisper not installed. Run: pip install faster-whisper]"
+
+    seg_dir = None
+    try:
+        language = _whisper_language()
+
+        seg_dir, segments = await _segment_audio(audio_path, chunk_s)
+
+        # Lock covers the whole job: segments within it still decode
+        # concurrently, but two jobs never overlap
+        async with _whisper_lock:
+            if len(segments) <= 1:
+                # Short audio or segmentation failure: single pass
+                transcription = await asyncio.to_thread(
+                    _transcribe_sync, model, audio_path, language
+                )
+            else:
+                workers = get_config("TRANSCRIBE_WORKERS", min(4, os.cpu_count() or 1))
+                sem = asyncio.Semaphore(workers)
+
+                async def _run(path: str):
+                    async with sem:
+                        return await asyncio.to_thread(_transcribe_sync, model, path, language)
+
+                results = await asyncio.gather(
+                    *(_run(path) for path in segments), return_exceptions=True
+                )
+
+                parts = []
+                for path, result in zip(segments, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Segment {os.path.basename(path)} failed: {result}")
+                    elif result:
+                        parts.append(result)
+                transcription = " ".join(parts)
+
+        if transcription:
+            logger.info(f"Chunked transcription completed ({len(transcription)} chars)")
+            return transcription
+        else:
+            return "[No audio content detected]"
+
+    except (RuntimeError, OSError, ValueError):
+        logger.exception("Chunked transcription failed")
+        return "[Transcription error]"
+    finally:
+        _touch_model()
+        if seg_dir:
+            await asyncio.to_thread(shutil.rmtree, seg_dir, True)
+
+
+async def transcribe_audio_large(audio_path: str, progress_callback=None) -> str:
     """
     Transcribes an audio file using the larger whisper model.
-    Runs the blocking transcription in a thread.
-    
+    Streams segments out of the decode thread like transcribe_audio().
+
     Args:
         audio_path: Path to audio file
-        
+        progress_callback: Optional async callable fired per decoded segment
+
     Returns:
         Transcription text or error message
     """
     model = get_whisper_model_large()
-    
+
     if model is None:
         return "[Error: faster-whisper not installed]"
-    
+
     try:
-        language = get_config("WHISPER_LANGUAGE")
-        
-        # Run blocking operation in thread
-        transcription = await asyncio.to_thread(
-            _transcribe_sync, model, audio_path, language
-        )
-        
-        transcription = " ".join(transcription.split())
-        
+        language = _whisper_language()
+
+        # Wider beam: quality path
+        async with _whisper_lock:
+            transcription = await _transcribe_streaming(
+                model, audio_path, language, beam_size=5,
+                progress_callback=progress_callback,
+            )
+
         if transcription:
             logger.info(f"Large model transcription completed ({len(transcription)} chars)")
             return transcription
         else:
             return "[No audio content detected]"
         
-    except Exception as e:
-        logger.error(f"Large transcription error: {e}")
-        return f"[Transcription error: {str(e)}]"
+    except (RuntimeError, OSError, ValueError):
+        logger.exception("Large model transcription failed")
+        return "[Transcription error]"
     finally:
-        unload_whisper_model_large()
+        _touch_model()
 
 
 def is_whisper_available() -> bool:
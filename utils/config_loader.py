@@ -1,8 +1,17 @@
 """Configuration loader for FemtoBot with validation and caching."""
+import functools
 import yaml
 import os
 import logging
-from typing import Optional, Dict, Any, Union
+import types
+from typing import Optional, Dict, Any, Mapping, Union
+
+# libyaml parser when PyYAML was built against it; the pure-Python
+# SafeLoader is an order of magnitude slower on reload/test paths
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +28,10 @@ DEFAULT_CONFIG = {
     "WHISPER_LANGUAGE": "es",
     "WHISPER_MODEL_VOICE": "turbo",
     "WHISPER_MODEL_EXTERNAL": "turbo",
+    "WHISPER_VAD": True,
+    "WHISPER_BEAM_SIZE": 1,
+    "WHISPER_DEVICE": None,
+    "WHISPER_COMPUTE_TYPE": None,
     "INACTIVITY_TIMEOUT_MINUTES": 60,
     "CRON_CLEANUP_INTERVAL_MINUTES": 30,
     "TIMEZONE_OFFSET_HOURS": -3,
@@ -76,10 +89,13 @@ def load_config(force_reload: bool = False) -> Dict[str, Any]:
         ConfigError: If config file cannot be loaded or is invalid
     """
     global _config, _config_path
-    
+
     if _config is not None and not force_reload:
         return _config
-    
+
+    # Any path below reassigns _config, so memoized lookups are stale
+    _cached_lookup.cache_clear()
+
     config_path = get_config_path()
     
     # Check if file exists
@@ -88,10 +104,10 @@ def load_config(force_reload: bool = False) -> Dict[str, Any]:
         _config = DEFAULT_CONFIG.copy()
         _config_path = config_path
         return _config
-    
+
     try:
         with open(config_path, "r", encoding="utf-8") as f:
-            loaded_config = yaml.safe_load(f)
+            loaded_config = yaml.load(f, Loader=_YamlLoader)
         
         if loaded_config is None:
             logger.warning(f"Config file is empty. Using defaults.")
@@ -121,46 +137,56 @@ def load_config(force_reload: bool = False) -> Dict[str, Any]:
         raise ConfigError(f"Error loading config: {e}")
 
 
+# Expected types for validated keys: one table, one loop
+_VALIDATION = (
+    ("CONTEXT_LIMIT", int),
+    ("MODEL", str),
+    ("WHISPER_MODEL_VOICE", str),
+    ("WHISPER_MODEL_AUDIO", str),
+    ("INSTRUCTIONS_FILE", str),
+    ("MEMORY_FILE", str),
+    ("EVENTS_FILE", str),
+)
+
+
 def _validate_config(config: Dict[str, Any]) -> None:
     """
     Validates configuration values.
-    
+
     Args:
         config: Configuration dictionary to validate
-        
+
     Raises:
         ConfigError: If validation fails
     """
-    # Validate numeric fields
+    for key, typ in _VALIDATION:
+        value = config.get(key)
+        if value is not None and not isinstance(value, typ):
+            raise ConfigError(f"{key} must be {typ.__name__}, got {type(value).__name__}")
+
     context_limit = config.get("CONTEXT_LIMIT")
-    if context_limit is not None and not isinstance(context_limit, int):
-        raise ConfigError(f"CONTEXT_LIMIT must be an integer, got {type(context_limit).__name__}")
     if context_limit is not None and context_limit < 1000:
         logger.warning(f"CONTEXT_LIMIT is very low ({context_limit}). This may cause issues.")
-    
-    # Validate string fields
-    string_fields = ["MODEL", "WHISPER_MODEL_VOICE", "WHISPER_MODEL_AUDIO"]
-    for field in string_fields:
-        value = config.get(field)
-        if value is not None and not isinstance(value, str):
-            raise ConfigError(f"{field} must be a string, got {type(value).__name__}")
-    
-    # Validate file paths
-    path_fields = ["INSTRUCTIONS_FILE", "MEMORY_FILE", "EVENTS_FILE"]
-    for field in path_fields:
-        value = config.get(field)
-        if value is not None and not isinstance(value, str):
-            raise ConfigError(f"{field} must be a string path, got {type(value).__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_lookup(key: str, default: Any) -> Any:
+    """Memoized dict lookup; cleared whenever load_config() reparses."""
+    return _config.get(key, default)
 
 
 def get_config(key: str, default: Any = None) -> Any:
     """
     Gets a config value by key with lazy loading.
-    
+
+    Repeated lookups of the same (key, default) pair are memoized, so
+    hot paths skip the None-check and dict hashing. Mutable defaults
+    (e.g. {}) are unhashable and transparently bypass the cache.
+
     Args:
         key: Configuration key to retrieve
         default: Default value if key is not found
-        
+
     Returns:
         Configuration value or default
     """
@@ -171,8 +197,11 @@ def get_config(key: str, default: Any = None) -> Any:
         except ConfigError as e:
             logger.error(f"Failed to load config: {e}. Using defaults.")
             _config = DEFAULT_CONFIG.copy()
-    
-    return _config.get(key, default)
+
+    try:
+        return _cached_lookup(key, default)
+    except TypeError:
+        return _config.get(key, default)
 
 
 def reload_config() -> Dict[str, Any]:
@@ -182,19 +211,27 @@ def reload_config() -> Dict[str, Any]:
     Returns:
         Updated configuration dictionary
     """
+    # Drop memoized config values held by other modules (lazy import:
+    # audio_utils imports this module at load time)
+    try:
+        from utils.audio_utils import _whisper_language
+        _whisper_language.cache_clear()
+    except Exception:
+        pass
     return load_config(force_reload=True)
 
 
-def get_all_config() -> Dict[str, Any]:
+def get_all_config() -> Mapping[str, Any]:
     """
-    Gets the entire configuration dictionary.
-    
+    Gets a read-only view of the entire configuration.
+
     Returns:
-        Complete configuration dictionary
+        Read-only mapping of configuration values. Callers that need a
+        mutable copy must dict(...) it explicitly.
     """
     if _config is None:
         load_config()
-    return _config.copy()
+    return types.MappingProxyType(_config)
 
 
 def is_feature_enabled(feature_name: str) -> bool:
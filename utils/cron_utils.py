@@ -3,6 +3,7 @@ import subprocess
 import shutil
 import re
 import logging
+import time
 from typing import List, Optional
 from datetime import datetime
 
@@ -35,6 +36,14 @@ class CronUtils:
     
     # Allowed characters in cron schedule (numbers, spaces, commas, dashes, slashes, asterisks)
     SCHEDULE_PATTERN = re.compile(r'^[\d\s,\-\*/]+$')
+
+    # Readable-agenda cache: the agenda goes into the system prompt on
+    # every message, but the crontab rarely changes between messages. The
+    # formatted string is reused for a short window and invalidated
+    # whenever this module writes the crontab.
+    AGENDA_CACHE_TTL = 10.0
+    _agenda_cache: str = ""
+    _agenda_cache_ts: float = 0.0
     
     @staticmethod
     def _validate_schedule(schedule: str) -> bool:
@@ -284,8 +293,9 @@ class CronUtils:
             if process.returncode != 0:
                 logger.error(f"Error saving crontab: {stderr}")
                 return False
-            
+
             logger.debug("Crontab updated successfully")
+            CronUtils._agenda_cache_ts = 0.0
             return True
             
         except Exception as e:
@@ -399,7 +409,19 @@ class CronUtils:
         """
         Returns a human-readable string of the current agenda.
         Parses crontab lines and converts them to a friendly format.
+        Cached for AGENDA_CACHE_TTL seconds; crontab writes invalidate it.
         """
+        if time.monotonic() - CronUtils._agenda_cache_ts < CronUtils.AGENDA_CACHE_TTL:
+            return CronUtils._agenda_cache
+
+        agenda = CronUtils._build_readable_agenda()
+        CronUtils._agenda_cache = agenda
+        CronUtils._agenda_cache_ts = time.monotonic()
+        return agenda
+
+    @staticmethod
+    def _build_readable_agenda() -> str:
+        """Parse the crontab and format it as a friendly agenda string."""
         jobs = CronUtils.get_crontab()
         if not jobs:
             return "No scheduled tasks."
@@ -1,4 +1,5 @@
 """Search utility using SearXNG (self-hosted meta-search engine)."""
+import asyncio
 import os
 import httpx
 import logging
@@ -21,114 +22,158 @@ def _get_searxng_url() -> str:
 
 SEARXNG_URL = _get_searxng_url()
 
+# One shared client for all searches: keepalive connections skip the
+# per-request TCP (and TLS) handshake, which otherwise dominates latency
+# on search-heavy workloads like deep research
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get or create the shared httpx client."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        kwargs = dict(
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=60
+            ),
+            # Client-level default; individual calls may still override
+            timeout=httpx.Timeout(15.0, connect=5.0),
+        )
+        try:
+            # HTTP/2 multiplexes concurrent hunts over one connection
+            # when SearXNG sits behind an h2-capable proxy
+            _shared_client = httpx.AsyncClient(http2=True, **kwargs)
+        except ImportError:
+            logger.info("h2 not installed, using HTTP/1.1 for search client")
+            _shared_client = httpx.AsyncClient(**kwargs)
+    return _shared_client
+
+
+async def aclose_shared_client() -> None:
+    """Close the shared search client (call on application shutdown)."""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
+
 
 class WebSearch:
     """
     Web search via SearXNG (self-hosted).
     """
-    
+
     @staticmethod
-    async def search(query: str, count: int = 3) -> str:
+    async def _fetch_results(
+        query: str,
+        count: int,
+        categories: str = "general",
+        timeout: float = 15.0
+    ) -> List[dict]:
         """
-        Search the web using SearXNG.
-        Returns formatted results as a string.
+        Shared retry loop behind search() and search_structured().
+
+        Backs off exponentially on 429 before giving up; other transient
+        errors are retried once per attempt with a flat delay. Raises on
+        final failure so callers can map errors to their own return shape.
         """
         params = {
             "q": query,
             "format": "json",
-            "categories": "general",
+            "categories": categories,
         }
-        
+
         max_retries = 3
         base_delay = 1.0
-        
+
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{SEARXNG_URL}/search",
-                        params=params,
-                        timeout=15.0
-                    )
-                    
-                    if response.status_code == 429:
-                        if attempt < max_retries - 1:
-                            import asyncio
-                            delay = base_delay * (2 ** attempt)
-                            logger.warning(f"SearXNG rate limit. Retrying in {delay}s...")
-                            await asyncio.sleep(delay)
-                            continue
-                        return "[Error: Rate limit exceeded]"
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    results = []
-                    for i, r in enumerate(data.get("results", [])[:count], 1):
-                        title = r.get("title", "No title")
-                        description = r.get("content", r.get("description", "No description"))
-                        url = r.get("url", "")
-                        results.append(f"{i}. **{title}**\n   {description}\n   {url}")
-                    
-                    if not results:
-                        return "[No results found]"
-                    
-                    return "\n\n".join(results)
-                    
-            except httpx.HTTPStatusError as e:
-                logger.error(f"SearXNG error: {e}")
-                return f"[Search error: {e.response.status_code}]"
-            except Exception as e:
-                logger.error(f"Search error: {e}")
+                response = await _get_client().get(
+                    f"{SEARXNG_URL}/search",
+                    params=params,
+                    timeout=timeout
+                )
+
+                if response.status_code == 429 and attempt < max_retries - 1:
+                    delay = base_delay * (2 ** attempt)
+                    logger.warning(f"SearXNG rate limit. Retrying in {delay}s...")
+                    await asyncio.sleep(delay)
+                    continue
+
+                response.raise_for_status()
+                return response.json().get("results", [])[:count]
+
+            except httpx.HTTPStatusError:
+                raise
+            except Exception:
                 if attempt < max_retries - 1:
-                    import asyncio
                     await asyncio.sleep(1)
                     continue
-                return f"[Search error: {str(e)}]"
-        
-        return "[Error: Maximum retries exceeded]"
-    
+                raise
+
+        raise RuntimeError("Maximum retries exceeded")
+
+    @staticmethod
+    async def search(query: str, count: int = 3) -> str:
+        """
+        Search the web using SearXNG.
+        Returns formatted results as a string.
+        """
+        try:
+            raw_results = await WebSearch._fetch_results(query, count)
+        except httpx.HTTPStatusError as e:
+            logger.error(f"SearXNG error: {e}")
+            if e.response.status_code == 429:
+                return "[Error: Rate limit exceeded]"
+            return f"[Search error: {e.response.status_code}]"
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            return f"[Search error: {str(e)}]"
+
+        results = []
+        for i, r in enumerate(raw_results, 1):
+            title = r.get("title", "No title")
+            description = r.get("content", r.get("description", "No description"))
+            url = r.get("url", "")
+            results.append(f"{i}. **{title}**\n   {description}\n   {url}")
+
+        if not results:
+            return "[No results found]"
+
+        return "\n\n".join(results)
+
     @staticmethod
-    async def _raw_search(query: str, count: int = 3) -> List[dict]:
+    async def search_structured(query: str, count: int = 3) -> List[dict]:
         """
-        Raw search returning structured results.
-        Returns list of dicts with title, description, url.
+        Search the web, returning structured results.
+
+        Returns a list of dicts with title, description and url, so callers
+        that need fields (e.g. the deep-research Hunter) don't have to parse
+        the formatted string back apart. Returns [] on any error.
         """
-        params = {
-            "q": query,
-            "format": "json",
-            "categories": "general",
-        }
-        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{SEARXNG_URL}/search",
-                    params=params,
-                    timeout=15.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                results = []
-                for r in data.get("results", [])[:count]:
-                    results.append({
-                        "title": r.get("title", ""),
-                        "description": r.get("content", r.get("description", "")),
-                        "url": r.get("url", "")
-                    })
-                return results
+            raw_results = await WebSearch._fetch_results(query, count)
         except Exception as e:
-            logger.error(f"Raw search error: {e}")
+            logger.error(f"Structured search error: {e}")
             return []
 
+        return [
+            {
+                "title": r.get("title", ""),
+                "description": r.get("content", r.get("description", "")),
+                "url": r.get("url", "")
+            }
+            for r in raw_results
+        ]
+
     @staticmethod
     async def search_with_scrape(query: str, count: int = 3) -> str:
         """
         Search the web and scrape the top results for full content.
         Returns formatted results with full page text for richer LLM context.
         """
-        raw_results = await WebSearch._raw_search(query, count)
+        raw_results = await WebSearch.search_structured(query, count)
         if not raw_results:
             return await WebSearch.search(query, count)
         
@@ -139,7 +184,6 @@ class WebSearch:
             logger.warning("WebFetcher not available, falling back to basic search")
             return await WebSearch.search(query, count)
         
-        import asyncio
         
         formatted = []
         
@@ -188,23 +232,23 @@ class WebSearch:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{SEARXNG_URL}/search",
-                    params=params,
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                image_urls = []
-                for r in data.get("results", []):
-                    img_url = r.get("img_src") or r.get("url", "")
-                    if img_url:
-                        image_urls.append(img_url)
-                
-                return image_urls[:count]
-                
+            response = await _get_client().get(
+                f"{SEARXNG_URL}/search",
+                params=params,
+                timeout=10.0
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            image_urls = []
+            for r in data.get("results", []):
+                img_url = r.get("img_src") or r.get("url", "")
+                if img_url:
+                    image_urls.append(img_url)
+
+            return image_urls[:count]
+
+
         except Exception as e:
             logger.error(f"Image search error: {e}")
             return []
@@ -10,6 +10,25 @@ _THINK_CLOSED_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
 _THINK_OPEN_RE = re.compile(r'<think>.*', re.DOTALL)
 _COMMAND_RE = re.compile(r':::\w+(?::)?\s*.*?:::', re.DOTALL)
 
+# ── Regex patterns for final response formatting ────────────────────
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+_MARKDOWN_ESCAPE_RE = re.compile(r'([_*\[\]()~`>#+\-=|{}.!])')
+_CODE_ESCAPE_RE = re.compile(r'([`\\])')
+
+# Command tokens stripped from visible output, in original order
+_COMMAND_STRIP_RES = (
+    re.compile(r':::memory(?::)?\s*.+?:::', re.DOTALL),
+    re.compile(r':::memory_delete(?::)?\s*.+?:::', re.DOTALL),
+    re.compile(r':::cron(?::)?\s*.+?:::', re.DOTALL),
+    re.compile(r':::cron_delete(?::)?\s*.+?:::', re.DOTALL),
+    re.compile(r':::search(?::)?\s*.+?:::'),
+    re.compile(r':::foto(?::)?\s*.+?:::', re.IGNORECASE),
+    re.compile(r':::luz(?::)?\s*.+?:::', re.IGNORECASE),
+    re.compile(r':::camara(?::)?(?:\s+\S+)?:::'),
+    re.compile(r':::terminal(?::)?\s*.+?:::', re.DOTALL),
+    re.compile(r':::matematicas.*?:::', re.DOTALL),
+)
+
 # Telegram message char limit
 _TG_MAX_LEN = 4000
 
@@ -94,13 +113,12 @@ async def telegramify_content(text: str, max_length: int = 4090):
 
 def escape_markdown(text: str) -> str:
     """Escapes Markdown special characters for Telegram."""
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    return re.sub(f'([{re.escape(escape_chars)}])', lambda m: '\\' + m.group(1), text)
+    return _MARKDOWN_ESCAPE_RE.sub(r'\\\1', text)
 
 
 def escape_code(text: str) -> str:
     """Escapes only backticks and backslashes for code blocks."""
-    return re.sub(r'([`\\])', lambda m: '\\' + m.group(1), text)
+    return _CODE_ESCAPE_RE.sub(r'\\\1', text)
 
 
 async def send_telegramify_results(context, chat_id, results, placeholder_msg=None, reply_to_message_id=None):
@@ -338,37 +356,20 @@ def format_bot_response(response: str) -> str:
         return ""
     
     formatted = response
-    
+
     # Strip thinking tags completely (e.g. Qwen3 <think>...</think>)
-    formatted = re.sub(r'<think>.*?</think>', '', formatted, flags=re.DOTALL)
+    formatted = _THINK_CLOSED_RE.sub('', formatted)
     # Handle unclosed <think> tag (model still thinking at end of response)
-    formatted = re.sub(r'<think>.*', '', formatted, flags=re.DOTALL)
-    
+    formatted = _THINK_OPEN_RE.sub('', formatted)
+
     # Remove ANSI color codes
-    formatted = re.sub(r'\x1b\[[0-9;]*m', '', formatted)
-    
-    # Handle memory commands - remove them from visible output
-    formatted = re.sub(r':::memory(?::)?\s*.+?:::', '', formatted, flags=re.DOTALL)
-    formatted = re.sub(r':::memory_delete(?::)?\s*.+?:::', '', formatted, flags=re.DOTALL)
-    
-    # Handle cron commands
-    formatted = re.sub(r':::cron(?::)?\s*.+?:::', '', formatted, flags=re.DOTALL)
-    formatted = re.sub(r':::cron_delete(?::)?\s*.+?:::', '', formatted, flags=re.DOTALL)
-    
-    # Handle search commands
-    formatted = re.sub(r':::search(?::)?\s*.+?:::', '', formatted)
-    formatted = re.sub(r':::foto(?::)?\s*.+?:::', '', formatted, flags=re.IGNORECASE)
-    
-    # Handle light/camera commands
-    formatted = re.sub(r':::luz(?::)?\s*.+?:::', '', formatted, flags=re.IGNORECASE)
-    formatted = re.sub(r':::camara(?::)?(?:\s+\S+)?:::', '', formatted)
-    
-    # Handle terminal commands
-    formatted = re.sub(r':::terminal(?::)?\s*.+?:::', '', formatted, flags=re.DOTALL)
-    
-    # Handle matematicas commands (when disabled, shouldn't show)
-    formatted = re.sub(r':::matematicas.*?:::', '', formatted, flags=re.DOTALL)
-    
+    formatted = _ANSI_RE.sub('', formatted)
+
+    # Strip command tokens (memory, cron, search, foto, luz, camara,
+    # terminal, matematicas) from visible output
+    for pattern in _COMMAND_STRIP_RES:
+        formatted = pattern.sub('', formatted)
+
     # LaTeX math is now handled automatically by telegramify-markdown
     
     # Strip wrapping quotes the LLM sometimes adds
@@ -379,35 +380,41 @@ def format_bot_response(response: str) -> str:
     return formatted
 
 
+def _content_len(msg: dict) -> int:
+    """Length of a message's content, skipping str() for the common case."""
+    content = msg.get("content", "")
+    return len(content) if isinstance(content, str) else len(str(content))
+
+
 def prune_history(history: list, limit: int = 30000) -> list:
     """Prune chat history to fit within token limit while keeping system prompt."""
     if not history:
         return []
-    
+
     # Always keep system prompt (first message if it's system)
-    if history and history[0].get("role") == "system":
+    if history[0].get("role") == "system":
         system_msg = history[0]
         messages = history[1:]
     else:
         system_msg = None
         messages = history
-    
-    # Calculate total length
-    total_length = sum(len(str(msg.get("content", ""))) for msg in history)
-    
+
+    lengths = [_content_len(msg) for msg in messages]
+    total_length = (_content_len(system_msg) if system_msg else 0) + sum(lengths)
+
     # If under limit, return all
     if total_length <= limit:
         return history
-    
-    # Remove oldest messages until under limit
-    while len(messages) > 1 and total_length > limit:
-        removed = messages.pop(0)
-        total_length -= len(str(removed.get("content", "")))
-    
-    # Reconstruct history
-    result = []
-    if system_msg:
-        result.append(system_msg)
-    result.extend(messages)
-    
+
+    # Count how many of the oldest messages to drop (always keep the
+    # newest one), then slice once instead of pop(0)-shifting the list
+    drop = 0
+    max_drop = len(messages) - 1
+    while drop < max_drop and total_length > limit:
+        total_length -= lengths[drop]
+        drop += 1
+
+    result = [system_msg] if system_msg else []
+    result.extend(messages[drop:])
+
     return result
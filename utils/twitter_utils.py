@@ -1,17 +1,25 @@
 """Twitter/X media download utilities using yt-dlp."""
+import functools
 import re
 import os
 import tempfile
 import asyncio
 
+_TWITTER_PATTERNS = [
+    re.compile(r'(https?://(www\.)?twitter\.com/\w+/status/\d+)'),
+    re.compile(r'(https?://(www\.)?x\.com/\w+/status/\d+)'),
+]
+
+
+@functools.lru_cache(maxsize=2048)
 def is_twitter_url(text: str) -> str | None:
-    """Check if text contains a Twitter/X URL."""
-    patterns = [
-        r'(https?://(www\.)?twitter\.com/\w+/status/\d+)',
-        r'(https?://(www\.)?x\.com/\w+/status/\d+)',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    """Check if text contains a Twitter/X URL.
+
+    Memoized: intent detection and media handling both probe the same
+    message text, so repeat lookups skip the regex scans.
+    """
+    for pattern in _TWITTER_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return None
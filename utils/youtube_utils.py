@@ -1,5 +1,7 @@
 """YouTube audio download utilities using yt-dlp."""
+import functools
 import tempfile
+import time
 import os
 import re
 import asyncio
@@ -7,15 +9,68 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Title cache keyed by canonical video id: repeated actions on the same
+# URL (common in group chats) skip the metadata fetch entirely
+_TITLE_CACHE: dict[str, tuple[float, str]] = {}
+_TITLE_TTL_SECONDS = 3600
+
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|/shorts/)([\w-]{11})')
+
+# Caps concurrent yt-dlp downloads so simultaneous requests from several
+# chats don't pile up worker threads or trip YouTube throttling
+_download_sem: asyncio.Semaphore | None = None
+
+
+def _get_download_sem() -> asyncio.Semaphore:
+    """Get or create the shared download concurrency limit."""
+    global _download_sem
+    if _download_sem is None:
+        try:
+            from utils.config_loader import get_config
+            limit = get_config("MAX_CONCURRENT_YT_DOWNLOADS", 3)
+        except Exception:
+            limit = 3
+        _download_sem = asyncio.Semaphore(limit)
+    return _download_sem
+
+
+def _ffmpeg_hwaccel_args() -> dict:
+    """yt-dlp postprocessor args enabling GPU decode when configured.
+
+    FFMPEG_HWACCEL: cuda routes ffmpeg post-processing through NVDEC on
+    machines with an Nvidia GPU; unset or other values keep CPU paths.
+    """
+    try:
+        from utils.config_loader import get_config
+        hwaccel = get_config("FFMPEG_HWACCEL", None)
+    except Exception:
+        hwaccel = None
+    if hwaccel != "cuda":
+        return {}
+    return {'postprocessor_args': {'ffmpeg_i': ['-hwaccel', 'cuda']}}
+
+
+def _video_id(url: str) -> str:
+    """Canonical video id for cache keys; falls back to the URL itself."""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else url
+
+_YOUTUBE_PATTERNS = [
+    re.compile(r'(https?://(www\.)?youtube\.com/watch\?v=[\w-]+)'),
+    re.compile(r'(https?://youtu\.be/[\w-]+)'),
+    re.compile(r'(https?://(www\.)?youtube\.com/shorts/[\w-]+)'),
+]
+
+
+@functools.lru_cache(maxsize=2048)
 def is_youtube_url(text: str) -> str | None:
-    """Check if text contains a YouTube URL. Returns the URL if found, None otherwise."""
-    patterns = [
-        r'(https?://(www\.)?youtube\.com/watch\?v=[\w-]+)',
-        r'(https?://youtu\.be/[\w-]+)',
-        r'(https?://(www\.)?youtube\.com/shorts/[\w-]+)',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    """Check if text contains a YouTube URL. Returns the URL if found, None otherwise.
+
+    Memoized: intent detection and media handling both probe the same
+    message text, so repeat lookups skip the regex scans.
+    """
+    for pattern in _YOUTUBE_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return None
@@ -40,10 +95,11 @@ def _download_audio_sync(url: str, temp_dir: str) -> str:
         'nocheckcertificate': True,
         'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     }
-    
+    ydl_opts.update(_ffmpeg_hwaccel_args())
+
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         ydl.download([url])
-    
+
     # Find the downloaded file
     for f in os.listdir(temp_dir):
         if f.endswith('.mp3'):
@@ -58,7 +114,8 @@ async def download_youtube_audio(url: str) -> str:
     """
     temp_dir = await asyncio.to_thread(tempfile.mkdtemp)
     try:
-        return await asyncio.to_thread(_download_audio_sync, url, temp_dir)
+        async with _get_download_sem():
+            return await asyncio.to_thread(_download_audio_sync, url, temp_dir)
     except Exception as e:
         logger.error(f"Error downloading audio: {e}")
         # Clean up temp dir if failed
@@ -66,12 +123,19 @@ async def download_youtube_audio(url: str) -> str:
         raise e
 
 def _get_title_sync(url: str) -> str:
-    """Synchronous title fetch."""
+    """Synchronous title fetch, cached by video id with a TTL."""
+    key = _video_id(url)
+    cached = _TITLE_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _TITLE_TTL_SECONDS:
+        return cached[1]
+
     try:
         import yt_dlp
         with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
             info = ydl.extract_info(url, download=False)
-            return info.get('title', 'Video')
+            title = info.get('title', 'Video')
+            _TITLE_CACHE[key] = (time.monotonic(), title)
+            return title
     except Exception as e:
         logger.warning(f"Error getting title: {e}")
         return "Video"
@@ -116,10 +180,11 @@ def _download_video_sync(url: str, temp_dir: str) -> str:
         'nocheckcertificate': True,
         'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     }
-    
+    ydl_opts.update(_ffmpeg_hwaccel_args())
+
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         ydl.download([url])
-    
+
     # Find file
     for f in os.listdir(temp_dir):
         if f.endswith('.mp4') or f.endswith('.mkv') or f.endswith('.webm'):
@@ -133,4 +198,5 @@ async def download_youtube_video(url: str) -> str:
     Returns the path to the downloaded mp4 file.
     """
     temp_dir = await asyncio.to_thread(tempfile.mkdtemp)
-    return await asyncio.to_thread(_download_video_sync, url, temp_dir)
+    async with _get_download_sem():
+        return await asyncio.to_thread(_download_video_sync, url, temp_dir)